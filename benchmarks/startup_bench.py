@@ -0,0 +1,108 @@
+"""mcp_server.py 시작 시간 벤치마크
+
+서버 프로세스를 매번 새로 띄워 첫 tools/list 응답까지 걸린 시간을 측정합니다.
+(spawn / import / handshake / toolsList 구간별로 나눠 SimpleMCPClient.startup_metrics 사용)
+
+사용 예:
+    python benchmarks/startup_bench.py --runs 10
+    python benchmarks/startup_bench.py --runs 10 --max-median 1.5   # 중앙값이 1.5초를 넘으면 종료 코드 1
+    python benchmarks/startup_bench.py --importtime                  # import 가 오래 걸리는 모듈 목록
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mcp_stdio_client import SimpleMCPClient  # noqa: E402
+
+PHASES = ("spawn", "import", "handshake", "toolsList", "total")
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure_once(command: str, args: list) -> dict:
+    client = SimpleMCPClient(command, args, on_error=lambda message: print(message, file=sys.stderr))
+    try:
+        if not await client.connect():
+            raise RuntimeError("서버 연결 실패: " + " / ".join(list(client.stderr_tail)[-5:]))
+        return dict(client.startup_metrics, tools=len(client.tools))
+    finally:
+        client.disconnect()
+
+
+def run_benchmark(runs: int, command: str, args: list) -> dict:
+    samples = []
+    for _ in range(runs):
+        samples.append(asyncio.run(measure_once(command, args)))
+
+    summary = {"runs": runs, "tools": samples[0]["tools"], "first": samples[0]}
+    for phase in PHASES:
+        values = [sample[phase] for sample in samples]
+        summary[phase] = {
+            "min": round(min(values), 4),
+            "median": round(statistics.median(values), 4),
+            "p95": round(percentile(values, 95), 4),
+            "max": round(max(values), 4),
+        }
+    return summary
+
+
+def import_times(limit: int = 20) -> list:
+    """python -X importtime 으로 mcp_server import 시 누적 시간이 큰 모듈 목록 (마이크로초)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_server"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if parts[0].isdigit():
+            rows.append((int(parts[1]), int(parts[0]), parts[2]))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mcp_server.py 시작 시간 (첫 tools/list 응답까지) 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", default=sys.executable)
+    parser.add_argument("--server", default=os.path.join(ROOT, "mcp_server.py"))
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--max-median", type=float, default=None, help="전체 시간 중앙값 상한 (초, 넘으면 종료 코드 1)")
+    parser.add_argument("--importtime", action="store_true", help="import 시간 상위 모듈 출력")
+    args = parser.parse_args()
+
+    if args.importtime:
+        for cumulative, own, module in import_times():
+            print(f"{cumulative / 1000:9.1f} ms  (self {own / 1000:7.1f} ms)  {module}")
+        return
+
+    summary = run_benchmark(args.runs, args.command, [args.server])
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"runs={summary['runs']} tools={summary['tools']}")
+        for phase in PHASES:
+            stats = summary[phase]
+            print(f"{phase:>10}: median {stats['median'] * 1000:8.1f} ms  p95 {stats['p95'] * 1000:8.1f} ms  "
+                  f"min {stats['min'] * 1000:8.1f} ms  max {stats['max'] * 1000:8.1f} ms")
+
+    if args.max_median is not None and summary["total"]["median"] > args.max_median:
+        print(f"시작 시간 중앙값 {summary['total']['median']:.3f}s 가 기준 {args.max_median:.3f}s 를 넘었습니다.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
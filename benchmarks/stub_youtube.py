@@ -0,0 +1,253 @@
+"""오프라인 벤치마크용 YouTube 스텁 서버
+
+실제 YouTube 대신 로컬에서 다음 엔드포인트를 흉내 냅니다.
+  /api/timedtext?v=&lang=          자막 XML (<text start dur>)
+  /watch?v=                        시청 페이지 (ytInitialPlayerResponse 의 captionTracks 포함)
+  /feeds/videos.xml?channel_id=    채널 RSS (ETag / If-None-Match → 304)
+  /youtube/v3/search|videos|channels   Data API JSON
+
+응답마다 latency 초 (+ 0 ~ jitter 초) 만큼 지연하고, failure_rate 확률로 500 (rate_limit_rate 확률로 429) 을 돌려줍니다.
+
+단독 실행:
+    python benchmarks/stub_youtube.py --port 8765 --latency 0.05 --failure-rate 0.01
+서버 환경 변수:
+    YOUTUBE_BASE_URL=http://127.0.0.1:8765
+    YOUTUBE_API_URL=http://127.0.0.1:8765/youtube/v3
+    YOUTUBE_FEED_URL=http://127.0.0.1:8765/feeds/videos.xml
+    TRANSCRIPT_METHODS=method4,method2   (youtube-transcript-api, yt-dlp 는 실제 YouTube 에만 접속)
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+WORDS = ("오늘은", "파이썬", "자막", "검색", "방법", "데이터", "서버", "캐시", "hello", "world",
+         "video", "python", "stream", "latency", "index", "query")
+
+
+def _rng(*parts) -> random.Random:
+    """같은 입력에는 항상 같은 내용을 만들도록 입력값으로 시드"""
+    seed = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def transcript_xml(video_id: str, lang: str, segments: int) -> str:
+    rng = _rng(video_id, lang)
+    start = 0.0
+    rows = []
+    for _ in range(segments):
+        duration = round(rng.uniform(1.5, 4.0), 2)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10)))
+        rows.append(f'<text start="{start:.2f}" dur="{duration:.2f}">{escape(text)}</text>')
+        start += duration
+    return '<?xml version="1.0" encoding="utf-8" ?><transcript>' + "".join(rows) + "</transcript>"
+
+
+def watch_page(base_url: str, video_id: str, page_bytes: int) -> str:
+    tracks = [
+        {"baseUrl": f"{base_url}/api/timedtext?v={video_id}&lang=ko", "languageCode": "ko", "kind": "asr",
+         "name": {"simpleText": "한국어 (자동 생성됨)"}},
+        {"baseUrl": f"{base_url}/api/timedtext?v={video_id}&lang=en", "languageCode": "en",
+         "name": {"simpleText": "English"}},
+    ]
+    player_response = {
+        "videoDetails": {"videoId": video_id, "title": f"Stub video {video_id}"},
+        "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": tracks}},
+    }
+    # 실제 시청 페이지처럼 큰 HTML (플레이어 응답 앞뒤로 스크립트가 많음)
+    filler = "<script>var filler='" + ("x" * 1000) + "';</script>\n"
+    padding = filler * max(page_bytes // len(filler) // 2, 0)
+    return ("<!DOCTYPE html><html><head>" + padding
+            + "<script>var ytInitialPlayerResponse = " + json.dumps(player_response, separators=(",", ":"), ensure_ascii=False) + ";</script>"
+            + padding + "</head><body></body></html>")
+
+
+def feed_xml(channel_id: str, videos: int) -> str:
+    entries = []
+    for i in range(videos):
+        video_id = hashlib.md5(f"{channel_id}{i}".encode()).hexdigest()[:11]
+        entries.append(
+            "<entry>"
+            f"<title>Stub video {i} of {escape(channel_id)}</title>"
+            f'<link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>'
+            f"<published>2024-01-{i + 1:02d}T00:00:00+00:00</published>"
+            "</entry>"
+        )
+    return '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">' + "".join(entries) + "</feed>"
+
+
+def channel_for(video_id: str) -> str:
+    return "UC" + hashlib.md5(video_id.encode()).hexdigest()[:6]
+
+
+class StubConfig:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, segments: int = 300, page_bytes: int = 1_000_000, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.segments = segments
+        self.page_bytes = page_bytes
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = {}  # 경로별 요청 수
+
+    def roll(self) -> tuple:
+        """(지연 초, 실패 상태 코드 또는 None)"""
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            value = self.random.random()
+        if value < self.rate_limit_rate:
+            return delay, 429
+        if value < self.rate_limit_rate + self.failure_rate:
+            return delay, 500
+        return delay, None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (커넥션 풀 재사용 측정)
+    config = None
+    base_url = ""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str = "", content_type: str = "text/plain", headers: dict = None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        config = self.config
+        with config.lock:
+            config.requests[url.path] = config.requests.get(url.path, 0) + 1
+
+        delay, failure = config.roll()
+        if delay:
+            time.sleep(delay)
+        if failure:
+            self._send(failure, "stub failure")
+            return
+
+        if url.path == "/api/timedtext":
+            self._send(200, transcript_xml(query.get("v", ""), query.get("lang", "en"), config.segments), "text/xml")
+        elif url.path == "/watch":
+            self._send(200, watch_page(self.base_url, query.get("v", ""), config.page_bytes), "text/html")
+        elif url.path == "/feeds/videos.xml":
+            channel_id = query.get("channel_id", "")
+            etag = '"' + hashlib.md5(channel_id.encode()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+            else:
+                self._send(200, feed_xml(channel_id, 15), "application/atom+xml", {"ETag": etag})
+        elif url.path.startswith("/youtube/v3/"):
+            self._send(200, json.dumps(self._data_api(url.path.rsplit("/", 1)[-1], query)), "application/json")
+        else:
+            self._send(404, "not found")
+
+    def _data_api(self, endpoint: str, query: dict) -> dict:
+        if endpoint == "search":
+            rng = _rng(query.get("q", ""))
+            count = int(query.get("maxResults", 5))
+            return {"items": [
+                {"id": {"kind": "youtube#video", "videoId": "".join(rng.choice("abcdefghijkABCDEFGHIJK0123456789_-") for _ in range(11))}}
+                for _ in range(count)
+            ]}
+        ids = [video_id for video_id in query.get("id", "").split(",") if video_id]
+        if endpoint == "videos":
+            return {"items": [{
+                "id": video_id,
+                "snippet": {
+                    "title": f"Stub video {video_id}",
+                    "publishedAt": "2024-01-01T00:00:00Z",
+                    "channelTitle": f"Stub channel {channel_for(video_id)}",
+                    "channelId": channel_for(video_id),
+                    "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                },
+                "statistics": {"viewCount": str(_rng(video_id).randint(0, 10 ** 6)), "likeCount": "10"},
+            } for video_id in ids]}
+        if endpoint == "channels":
+            return {"items": [{
+                "id": channel_id,
+                "snippet": {"title": f"Stub channel {channel_id}"},
+                "statistics": {"subscriberCount": "1000", "viewCount": "100000", "videoCount": "15"},
+            } for channel_id in ids]}
+        return {"items": []}
+
+
+class StubYouTubeServer:
+    """백그라운드 스레드에서 실행되는 스텁 서버 (with 문으로 사용)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **config):
+        self.config = StubConfig(**config)
+        handler = type("BoundStubHandler", (StubHandler,), {"config": self.config})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        handler.base_url = self.base_url
+        self._thread = None
+
+    def env(self) -> dict:
+        """mcp_server 가 이 스텁을 사용하도록 하는 환경 변수"""
+        return {
+            "YOUTUBE_BASE_URL": self.base_url,
+            "YOUTUBE_API_URL": f"{self.base_url}/youtube/v3",
+            "YOUTUBE_FEED_URL": f"{self.base_url}/feeds/videos.xml",
+            "TRANSCRIPT_METHODS": "method4,method2",
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-youtube", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크용 YouTube 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 최대값 (초)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--segments", type=int, default=300, help="영상당 자막 구간 수")
+    parser.add_argument("--page-bytes", type=int, default=1_000_000, help="시청 페이지 크기")
+    args = parser.parse_args()
+
+    server = StubYouTubeServer(
+        args.host, args.port, latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate, segments=args.segments, page_bytes=args.page_bytes
+    )
+    for name, value in server.env().items():
+        print(f"{name}={value}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""mcp_server.py 도구 오프라인 벤치마크
+
+로컬 스텁 YouTube 서버(stub_youtube.py)를 띄우고 도구별로
+  - cold: 처음 보는 영상/검색어 (캐시 없음)
+  - warm: 같은 영상/검색어 반복 (캐시 사용)
+지연 시간 p50/p95/p99 와 초당 호출 수를 측정합니다. 네트워크 없이 실행됩니다.
+
+사용 예:
+    python benchmarks/tool_bench.py --calls 200 --concurrency 16 --latency 0.05
+    python benchmarks/tool_bench.py --mode stdio --tools get_youtube_transcript --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+from stub_youtube import StubYouTubeServer  # noqa: E402
+from startup_bench import percentile  # noqa: E402
+
+# 도구 이름 -> (i 번째 호출 인자를 만드는 함수, cold/warm 구분 여부)
+SCENARIOS = {
+    "get_youtube_transcript": (lambda key: {"url": f"https://www.youtube.com/watch?v={key}"}, True),
+    "get_youtube_transcript_chunk": (lambda key: {"url": f"https://www.youtube.com/watch?v={key}", "limit": 2000}, True),
+    "search_youtube_videos": (lambda key: {"query": f"bench query {key}"}, True),
+    "get_channel_info": (lambda key: {"video_url": f"https://www.youtube.com/watch?v={key}"}, True),
+    "search_transcripts": (lambda key: {"query": "파이썬 검색"}, False),
+}
+
+
+def bench_environment(stub: StubYouTubeServer, work_dir: str) -> dict:
+    """스텁 서버를 사용하고 할당량/캐시가 측정을 방해하지 않도록 하는 서버 환경 변수"""
+    env = stub.env()
+    env.update({
+        "YOUTUBE_API_KEY": "bench",
+        "TRANSCRIPT_CACHE_PATH": os.path.join(work_dir, "bench_cache.db"),
+        "YOUTUBE_QUOTA_DAILY_BUDGET": str(10 ** 9),
+        "YOUTUBE_QUOTA_RATE": str(10 ** 6),
+        "YOUTUBE_QUOTA_BURST": str(10 ** 6),
+        "TRANSCRIPT_RANKER_PROBE_INTERVAL": str(10 ** 6),
+    })
+    return env
+
+
+def video_key(tool_index: int, run: int, i: int) -> str:
+    """도구/회차마다 겹치지 않는 11자리 비디오 ID"""
+    return f"b{tool_index}{run}{i:08d}"[-11:].rjust(11, "x")
+
+
+class InProcessCaller:
+    """mcp_server 모듈을 import 해 도구 함수를 직접 호출"""
+
+    async def start(self):
+        import mcp_server
+        self.server = mcp_server
+
+    async def call(self, tool: str, arguments: dict) -> bool:
+        result = getattr(self.server, tool)(**arguments)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return not (isinstance(result, dict) and result.get("isError"))
+
+    async def stop(self):
+        pass
+
+
+class StdioCaller:
+    """SimpleMCPClient 로 서버 프로세스를 띄워 JSON-RPC 로 호출 (전송 계층 비용 포함)"""
+
+    async def start(self):
+        from mcp_stdio_client import SimpleMCPClient
+        self.client = SimpleMCPClient(sys.executable, [os.path.join(ROOT, "mcp_server.py")],
+                                      on_error=lambda message: None)
+        if not await self.client.connect():
+            raise RuntimeError("서버 연결 실패: " + " / ".join(list(self.client.stderr_tail)[-5:]))
+
+    async def call(self, tool: str, arguments: dict) -> bool:
+        result = await self.client.call_tool(tool, arguments)
+        if not result or result.get("isError"):
+            return False
+        content = result.get("content") or []
+        if content and content[0].get("type") == "text":
+            try:
+                payload = json.loads(content[0]["text"])
+                return not (isinstance(payload, dict) and payload.get("isError"))
+            except json.JSONDecodeError:
+                pass
+        return True
+
+    async def stop(self):
+        self.client.disconnect()
+
+
+async def run_pass(caller, tool: str, argument_list: list, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(arguments):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await caller.call(tool, arguments)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(arguments) for arguments in argument_list])
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": len(argument_list),
+        "errors": errors,
+        "p50Ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95Ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99Ms": round(percentile(latencies, 99) * 1000, 2),
+        "callsPerSecond": round(len(argument_list) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+async def run_benchmark(args, stub: StubYouTubeServer) -> dict:
+    caller = StdioCaller() if args.mode == "stdio" else InProcessCaller()
+    await caller.start()
+    results = {}
+    try:
+        for tool_index, tool in enumerate(args.tools):
+            make_arguments, has_cold = SCENARIOS[tool]
+            keys = [video_key(tool_index, 0, i) for i in range(args.calls)]
+            argument_list = [make_arguments(key) for key in keys]
+            requests_before = sum(stub.config.requests.values())
+            results[tool] = {}
+            if has_cold:
+                results[tool]["cold"] = await run_pass(caller, tool, argument_list, args.concurrency)
+            results[tool]["warm"] = await run_pass(caller, tool, argument_list, args.concurrency)
+            results[tool]["backendRequests"] = sum(stub.config.requests.values()) - requests_before
+    finally:
+        await caller.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스텁 YouTube 서버로 mcp_server 도구 지연 시간/처리량 측정")
+    parser.add_argument("--mode", choices=("inprocess", "stdio"), default="inprocess")
+    parser.add_argument("--tools", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--calls", type=int, default=100, help="도구별 호출 수 (서로 다른 영상/검색어 수)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="스텁 응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--segments", type=int, default=300)
+    parser.add_argument("--page-bytes", type=int, default=1_000_000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir, StubYouTubeServer(
+        latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate, segments=args.segments, page_bytes=args.page_bytes
+    ) as stub:
+        # mcp_server 는 import 시점에 환경 변수를 읽으므로 먼저 설정 (stdio 모드는 하위 프로세스가 상속)
+        os.environ.update(bench_environment(stub, work_dir))
+        results = asyncio.run(run_benchmark(args, stub))
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    print(f"mode={args.mode} calls={args.calls} concurrency={args.concurrency} stub latency={args.latency}s "
+          f"failure={args.failure_rate} rateLimit={args.rate_limit_rate}")
+    for tool, phases in results.items():
+        for phase in ("cold", "warm"):
+            if phase not in phases:
+                continue
+            stats = phases[phase]
+            print(f"{tool:>30} {phase:>4}: p50 {stats['p50Ms']:8.2f} ms  p95 {stats['p95Ms']:8.2f} ms  "
+                  f"p99 {stats['p99Ms']:8.2f} ms  {stats['callsPerSecond']:8.1f} calls/s  errors {stats['errors']}")
+        print(f"{'':>30} backend requests: {phases['backendRequests']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from http_client import async_get
+from metrics import registry as metrics_registry
+
+YOUTUBE_FEED_URL = os.getenv("YOUTUBE_FEED_URL", "https://www.youtube.com/feeds/videos.xml")
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+
+
+def parse_feed(xml_text: str, limit: int = 5) -> list:
+    """채널 RSS(Atom) 피드에서 최근 영상 목록 추출"""
+    import xml.etree.ElementTree as ET
+
+    root = ET.fromstring(xml_text)
+    videos = []
+
+    for entry in root.findall('.//atom:entry', ATOM_NS)[:limit]:
+        title_elem = entry.find('./atom:title', ATOM_NS)
+        link_elem = entry.find('./atom:link', ATOM_NS)
+        published_elem = entry.find('./atom:published', ATOM_NS)
+
+        if title_elem is not None and link_elem is not None and published_elem is not None:
+            videos.append({
+                'title': title_elem.text or '',
+                'link': link_elem.attrib.get('href', ''),
+                'published': published_elem.text or '',
+            })
+
+    return videos
+
+
+class FeedCache:
+    """채널 RSS 피드 캐시 (ETag / Last-Modified 조건부 요청)
+
+    저장된 피드는 조건부 요청으로 재검증하고, 304 응답이면 본문 전송과 XML 파싱 없이
+    이전에 파싱한 목록을 그대로 사용합니다. fresh_ttl 초 이내면 재검증 요청도 생략합니다.
+    """
+
+    def __init__(self, fresh_ttl: float = 60, maxsize: int = 2000, limit: int = 5):
+        self.fresh_ttl = fresh_ttl
+        self.maxsize = maxsize
+        self.limit = limit
+        self._entries = OrderedDict()  # channel_id -> dict(etag, last_modified, videos, validated_at)
+        self.hits = 0
+        self.not_modified = 0
+        self.downloads = 0
+        self.errors = 0
+
+    def _result(self, entry: dict) -> list:
+        updated = datetime.fromtimestamp(entry['validated_at']).strftime("%Y-%m-%d %H:%M:%S")
+        return [dict(video, updatedDate=updated) for video in entry['videos']]
+
+    async def get_recent_videos(self, channel_id: str) -> list:
+        """채널의 최근 영상 목록 (요청/파싱 실패 시 이전 목록 - 이전 목록이 없으면 오류 응답은 빈 목록, 네트워크/파싱 오류는 예외)"""
+        entry = self._entries.get(channel_id)
+        now = time.time()
+        if entry is not None:
+            self._entries.move_to_end(channel_id)
+            if now - entry['validated_at'] < self.fresh_ttl:
+                self.hits += 1
+                return self._result(entry)
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            with metrics_registry.measure("rss", "channel_feed") as observation:
+                response = await async_get(f"{YOUTUBE_FEED_URL}?channel_id={channel_id}", headers=headers)
+                if response.status_code not in (200, 304):
+                    observation.fail(f"http_{response.status_code}")
+        except Exception:
+            # 네트워크 오류 - 이전 목록이 있으면 그대로 사용
+            self.errors += 1
+            if entry is not None:
+                return self._result(entry)
+            raise
+
+        if response.status_code == 304 and entry is not None:
+            # 변경 없음 - 본문 없이 이전 파싱 결과 재사용
+            self.not_modified += 1
+            entry['validated_at'] = now
+            return self._result(entry)
+
+        if response.status_code != 200:
+            return self._result(entry) if entry is not None else []
+
+        try:
+            videos = parse_feed(response.text, self.limit)
+        except Exception:
+            # 잘린/잘못된 XML - 이전 목록이 있으면 그대로 사용
+            self.errors += 1
+            if entry is not None:
+                return self._result(entry)
+            raise
+
+        self.downloads += 1
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'videos': videos,
+            'validated_at': now,
+        }
+        self._entries[channel_id] = entry
+        self._entries.move_to_end(channel_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return self._result(entry)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "notModified": self.not_modified,
+            "downloads": self.downloads,
+            "errors": self.errors,
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import threading
+import urllib.parse
+
+import httpx
+
+from metrics import add_transfer_bytes
+
+# 공용 HTTP 커넥션 풀 설정
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # 동시에 유지할 호스트 수
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))  # 호스트당 최대 연결 수
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.3"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+
+# 재시도할 응답 상태 코드 (일시적인 서버 오류)
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+class PoolStats:
+    """커넥션 풀 재사용(hit) / 새 연결(miss) 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            requests_count = self.requests
+            misses = self.new_connections
+        return {
+            "requests": requests_count,
+            "hits": max(requests_count - misses, 0),
+            "misses": misses,
+        }
+
+
+pool_stats = PoolStats()
+
+
+async def _trace(event_name: str, info: dict):
+    """httpcore trace 이벤트로 새 TCP 연결 생성을 집계"""
+    if event_name == "connection.connect_tcp.complete":
+        pool_stats.record_new_connection()
+
+
+async def _on_request(request: httpx.Request):
+    pool_stats.record_request()
+    request.extensions["trace"] = _trace
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """keep-alive 커넥션 풀과 연결 재시도가 설정된 비동기 클라이언트 생성"""
+    limits = httpx.Limits(
+        max_connections=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+        max_keepalive_connections=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+        keepalive_expiry=30.0,
+    )
+    transport = httpx.AsyncHTTPTransport(retries=HTTP_MAX_RETRIES, limits=limits)
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        event_hooks={"request": [_on_request]},
+    )
+
+
+_client = None
+_host_semaphores = {}
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """모든 도구가 공유하는 모듈 단위 비동기 클라이언트"""
+    global _client
+    if _client is None:
+        _client = create_async_client()
+    return _client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """호스트별 동시 연결 수 제한"""
+    host = urllib.parse.urlsplit(url).netloc
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(HTTP_POOL_MAXSIZE)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+async def async_get(url: str, **kwargs) -> httpx.Response:
+    """공용 클라이언트로 GET 요청 (일시적인 5xx 응답은 지수 백오프로 재시도)"""
+    client = get_async_client()
+    async with _host_semaphore(url):
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            response = await client.get(url, **kwargs)
+            # 응답 본문 크기를 현재 측정 중인 자막 추출 방법 / API 엔드포인트에 합산
+            add_transfer_bytes(len(response.content))
+            if response.status_code not in RETRY_STATUS_CODES or attempt == HTTP_MAX_RETRIES:
+                return response
+            await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+    return response
+
+
+async def close_async_client():
+    """공용 클라이언트 종료"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_pool_stats() -> dict:
+    """커넥션 풀 hit/miss 카운터와 설정값"""
+    stats = pool_stats.snapshot()
+    stats.update({
+        "poolConnections": HTTP_POOL_CONNECTIONS,
+        "poolMaxsize": HTTP_POOL_MAXSIZE,
+        "maxRetries": HTTP_MAX_RETRIES,
+        "timeout": HTTP_TIMEOUT,
+    })
+    return stats
@@ -4,7 +4,8 @@ import streamlit as st
 import json
 from openai import OpenAI
 from dotenv import load_dotenv
-import subprocess
+from mcp_server_pool import MCPServerPool
+import os
 import time
 
 load_dotenv()
@@ -13,136 +14,25 @@ load_dotenv()
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-class SimpleMCPClient:
-    def __init__(self, command, args):
-        self.command = command
-        self.args = args
-        self.process = None
-        self.tools = []
-        
-    async def connect(self):
-        """MCP 서버에 연결"""
-        try:
-            # MCP 서버 프로세스 시작
-            self.process = subprocess.Popen(
-                [self.command] + self.args,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            
-            # 잠시 대기
-            await asyncio.sleep(1)
-            
-            # 1. 초기화 메시지 전송
-            init_message = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "clientInfo": {
-                        "name": "streamlit-client",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-            
-            await self._send_message(init_message)
-            init_response = await self._read_message()
-            
-            if not init_response.get("result"):
-                return False
-            
-            # 2. 초기화 완료 알림
-            initialized_message = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-            await self._send_message(initialized_message)
-            
-            # 3. 도구 목록 요청
-            tools_message = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list"
-            }
-            await self._send_message(tools_message)
-            tools_response = await self._read_message()
-            
-            if tools_response.get("result") and "tools" in tools_response["result"]:
-                self.tools = tools_response["result"]["tools"]
-                return True
-            
-            return False
-            
-        except Exception as e:
-            st.error(f"MCP 서버 연결 오류: {str(e)}")
-            return False
-    
-    async def _send_message(self, message):
-        """메시지 전송"""
-        if self.process and self.process.stdin:
-            message_str = json.dumps(message) + "\n"
-            self.process.stdin.write(message_str)
-            self.process.stdin.flush()
-    
-    async def _read_message(self):
-        """메시지 수신"""
-        if self.process and self.process.stdout:
-            line = self.process.stdout.readline()
-            if line:
-                return json.loads(line.strip())
-        return {}
-    
-    async def call_tool(self, tool_name, arguments):
-        """도구 호출"""
-        try:
-            call_message = {
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-            
-            await self._send_message(call_message)
-            response = await self._read_message()
-            
-            if response.get("result"):
-                return response["result"]
-            else:
-                return None
-                
-        except Exception as e:
-            st.error(f"도구 호출 오류: {str(e)}")
-            return None
-    
-    def disconnect(self):
-        """연결 종료"""
-        if self.process:
-            self.process.terminate()
-            self.process.wait()
+# MCP 서버 풀 설정 (모든 브라우저 세션이 같은 서버 프로세스들을 공유)
+MCP_SERVER_POOL_SIZE = int(os.getenv("MCP_SERVER_POOL_SIZE", "2"))
+MCP_SERVER_HEALTH_INTERVAL = float(os.getenv("MCP_SERVER_HEALTH_INTERVAL", "30"))
 
-# MCP 서버 설정
 @st.cache_resource
+def get_mcp_server_pool():
+    """프로세스 전체에서 한 번만 만드는 MCP 서버 풀 (세션마다 서버를 띄우지 않음)"""
+    pool = MCPServerPool(
+        "python", ["mcp_server.py"],
+        size=MCP_SERVER_POOL_SIZE,
+        health_interval=MCP_SERVER_HEALTH_INTERVAL,
+        on_error=st.error
+    )
+    pool.start()
+    return pool
+
 async def setup_mcp_servers():
     try:
-        mcp_client = SimpleMCPClient("python", ["mcp_server.py"])
-        if await mcp_client.connect():
-            return mcp_client
-        else:
-            st.error("MCP 서버 연결 실패")
-            return None
+        return get_mcp_server_pool()
     except Exception as e:
         st.error(f"MCP 서버 설정 오류: {str(e)}")
         return None
@@ -235,10 +125,10 @@ async def process_user_message():
             response_text = await generate_response(user_input, mcp_client)
             
             # 응답을 채팅 기록에 추가
-        st.session_state.chat_history.append({
-            "role": "assistant",
-            "content": response_text
-        })
+            st.session_state.chat_history.append({
+                "role": "assistant",
+                "content": response_text
+            })
         else:
             st.error("사용자 메시지를 찾을 수 없습니다.")
     else:
@@ -291,12 +181,12 @@ def main():
                         last_response = st.session_state.chat_history[-1]
                         if last_response["role"] == "assistant":
                             st.markdown(last_response["content"])
-        except Exception as e:
-            st.error(f"처리 중 오류 발생: {str(e)}")
-            st.session_state.chat_history.append({
-                "role": "assistant", 
-                "content": f"오류가 발생했습니다: {str(e)}"
-            })
+                except Exception as e:
+                    st.error(f"처리 중 오류 발생: {str(e)}")
+                    st.session_state.chat_history.append({
+                        "role": "assistant", 
+                        "content": f"오류가 발생했습니다: {str(e)}"
+                    })
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
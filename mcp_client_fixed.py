@@ -4,7 +4,8 @@ import streamlit as st
 import json
 from openai import OpenAI
 from dotenv import load_dotenv
-import subprocess
+from mcp_server_pool import MCPServerPool
+import os
 import time
 import re
 
@@ -14,135 +15,25 @@ load_dotenv()
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-class SimpleMCPClient:
-    def __init__(self, command, args):
-        self.command = command
-        self.args = args
-        self.process = None
-        self.tools = []
-        
-    async def connect(self):
-        """MCP 서버에 연결"""
-        try:
-            # MCP 서버 프로세스 시작
-            self.process = subprocess.Popen(
-                [self.command] + self.args,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0,
-                encoding='utf-8',
-                errors='ignore'
-            )
-            
-            # 잠시 대기
-            await asyncio.sleep(1)
-            
-            # 1. 초기화 메시지 전송
-            init_message = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "clientInfo": {
-                        "name": "streamlit-client",
-                        "version": "1.0.0"
-                    }
-                }
-            }
-            
-            await self._send_message(init_message)
-            init_response = await self._read_message()
-            
-            if not init_response.get("result"):
-                return False
-            
-            # 2. 초기화 완료 알림
-            initialized_message = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-            await self._send_message(initialized_message)
-            
-            # 3. 도구 목록 요청
-            tools_message = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list"
-            }
-            await self._send_message(tools_message)
-            tools_response = await self._read_message()
-            
-            if tools_response.get("result") and "tools" in tools_response["result"]:
-                self.tools = tools_response["result"]["tools"]
-                return True
-            
-            return False
-            
-        except Exception as e:
-            st.error(f"MCP 서버 연결 오류: {str(e)}")
-            return False
-    
-    async def _send_message(self, message):
-        """메시지 전송"""
-        if self.process and self.process.stdin:
-            message_str = json.dumps(message) + "\n"
-            self.process.stdin.write(message_str)
-            self.process.stdin.flush()
-    
-    async def _read_message(self):
-        """메시지 수신"""
-        if self.process and self.process.stdout:
-            line = self.process.stdout.readline()
-            if line:
-                return json.loads(line.strip())
-        return {}
-    
-    async def call_tool(self, tool_name, arguments):
-        """도구 호출"""
-        try:
-            call_message = {
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-            
-            await self._send_message(call_message)
-            response = await self._read_message()
-            
-            if response.get("result"):
-                return response["result"]
-            else:
-                return None
-                
-        except Exception as e:
-            st.error(f"도구 호출 오류: {str(e)}")
-            return None
-    
-    def disconnect(self):
-        """연결 종료"""
-        if self.process:
-            self.process.terminate()
-            self.process.wait()
+# MCP 서버 풀 설정 (모든 브라우저 세션이 같은 서버 프로세스들을 공유)
+MCP_SERVER_POOL_SIZE = int(os.getenv("MCP_SERVER_POOL_SIZE", "2"))
+MCP_SERVER_HEALTH_INTERVAL = float(os.getenv("MCP_SERVER_HEALTH_INTERVAL", "30"))
+
+@st.cache_resource
+def get_mcp_server_pool():
+    """프로세스 전체에서 한 번만 만드는 MCP 서버 풀 (세션마다 서버를 띄우지 않음)"""
+    pool = MCPServerPool(
+        "python", ["mcp_server.py"],
+        size=MCP_SERVER_POOL_SIZE,
+        health_interval=MCP_SERVER_HEALTH_INTERVAL,
+        on_error=st.error
+    )
+    pool.start()
+    return pool
 
-# MCP 서버 설정 (캐시 제거)
 async def setup_mcp_servers():
     try:
-        mcp_client = SimpleMCPClient("python", ["mcp_server.py"])
-        if await mcp_client.connect():
-            return mcp_client
-        else:
-            st.error("MCP 서버 연결 실패")
-            return None
+        return get_mcp_server_pool()
     except Exception as e:
         st.error(f"MCP 서버 설정 오류: {str(e)}")
         return None
@@ -227,7 +118,8 @@ async def generate_response(user_message, mcp_client):
             if urls:
                 url = urls[0]
                 print(f"자막을 추출하는 중... URL: {url}")
-                transcript_result = await mcp_client.call_tool("get_youtube_transcript", {"url": url})
+                # 화면에 표시할 처음 500자만 요청 (전체 자막은 서버 캐시에 남음)
+                transcript_result = await mcp_client.call_tool("get_youtube_transcript_chunk", {"url": url, "limit": 500})
                 
                 # 자막 추출 결과 확인
                 if transcript_result and isinstance(transcript_result, dict):
@@ -240,7 +132,14 @@ async def generate_response(user_message, mcp_client):
                     if 'content' in transcript_result:
                         content = transcript_result['content']
                         if content and len(content) > 0 and 'text' in content[0]:
-                            transcript_text = content[0]['text']
+                            try:
+                                chunk = json.loads(content[0]['text'])
+                            except json.JSONDecodeError:
+                                chunk = {"text": content[0]['text']}
+                            if chunk.get('isError'):
+                                print("자막 추출 오류 감지, 대안 정보 제공")
+                                return await get_video_alternative_info(url, mcp_client)
+                            transcript_text = chunk.get('text', '')
                             return f"**자막 내용 (처음 500자):**\n\n{transcript_text[:500]}..."
                         else:
                             print("자막 내용이 비어있음, 대안 정보 제공")
@@ -298,11 +197,8 @@ async def generate_response(user_message, mcp_client):
 
 # 메시지 처리
 async def process_user_message():
-    # 세션 상태에서 MCP 클라이언트 가져오기 또는 새로 생성
-    if "mcp_client" not in st.session_state:
-        st.session_state.mcp_client = await setup_mcp_servers()
-    
-    mcp_client = st.session_state.mcp_client
+    # 공유 MCP 서버 풀 (호출마다 사용 중인 호출이 가장 적은 서버를 빌려 씀)
+    mcp_client = await setup_mcp_servers()
     
     if not mcp_client:
         st.error("MCP 서버를 연결할 수 없습니다.")
@@ -343,10 +239,6 @@ def main():
         
         if st.button("채팅 기록 초기화"):
             st.session_state.chat_history = []
-            # MCP 클라이언트도 초기화
-            if "mcp_client" in st.session_state:
-                st.session_state.mcp_client.disconnect()
-                del st.session_state.mcp_client
             st.rerun()
         
         st.markdown("### 사용법")
@@ -1,274 +1,809 @@
+import time
+IMPORT_STARTED = time.perf_counter()  # 시작 시간 측정 (모듈 import 소요 시간)
+
 from mcp.server.fastmcp import FastMCP
+import httpx
 
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+# youtube_transcript_api, ElementTree 는 서버 시작(initialize 응답)을 늦추지 않도록 처음 사용할 때 import
+# (httpx 는 mcp.server.fastmcp 가 이미 import 하므로 미뤄도 효과가 없음)
 import urllib.parse
-import xml.etree.ElementTree as ET
-from datetime import datetime
-import requests
+import asyncio
+import concurrent.futures
 import re
+import sys
+import json
+import base64
+import html
+import shutil
+import tempfile
+import unicodedata
 from dotenv import load_dotenv
 import os
-load_dotenv()
+load_dotenv()  # http_client 등 모듈이 import 시점에 환경 변수를 읽으므로 먼저 로드
+from transcript_cache import TranscriptCache
+from transcript_segments import TranscriptSegments
+from transcript_index import TranscriptIndex
+from shared_store import SharedStore
+from subtitle_cache import SubtitleFileCache
+from http_client import async_get, get_pool_stats
+from method_ranker import MethodRanker
+from ttl_cache import AsyncTTLCache
+from video_metadata import VideoMetadataStore
+from feed_cache import FeedCache
+from player_response import find_player_response, caption_tracks, is_playable, rank_caption_tracks, CaptionTrackCache
+from metrics import registry as metrics_registry, start_prometheus_server
+from quota import QuotaScheduler, QuotaExceededError, PRIORITY_NORMAL, PRIORITY_LOW
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
-YOUTUBE_API_URL = 'https://www.googleapis.com/youtube/v3'
+# 외부 엔드포인트 주소 (오프라인 벤치마크에서는 로컬 스텁 서버로 바꿔 사용)
+YOUTUBE_API_URL = os.getenv("YOUTUBE_API_URL", 'https://www.googleapis.com/youtube/v3')
+YOUTUBE_BASE_URL = os.getenv("YOUTUBE_BASE_URL", "https://www.youtube.com")  # timedtext, 시청 페이지
+
+# 자막 캐시 설정 (서버 재시작 후에도 유지되는 SQLite 캐시)
+TRANSCRIPT_CACHE_PATH = os.getenv("TRANSCRIPT_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcript_cache.db"))
+TRANSCRIPT_CACHE_TTL = int(os.getenv("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "5000"))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# yt-dlp 자막 추출 설정 (받은 자막 파일은 내용 해시 이름으로 캐시, 한도를 넘으면 오래 사용하지 않은 파일부터 삭제)
+# YT_DLP_TIMEOUT: 영상 하나의 전체 추출 제한 시간 (Python API / CLI 공통), YT_DLP_SOCKET_TIMEOUT: 요청 하나의 네트워크 제한 시간
+YT_DLP_TIMEOUT = float(os.getenv("YT_DLP_TIMEOUT", "60"))
+YT_DLP_SOCKET_TIMEOUT = float(os.getenv("YT_DLP_SOCKET_TIMEOUT", "15"))
+# Python API 추출 전용 스레드 수 (멈춘 추출이 기본 스레드 풀의 캐시 조회를 막지 않도록 분리)
+YT_DLP_WORKERS = int(os.getenv("YT_DLP_WORKERS", "2"))
+SUBTITLE_CACHE_DIR = os.getenv("SUBTITLE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle_cache"))
+SUBTITLE_CACHE_MAX_BYTES = int(os.getenv("SUBTITLE_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+SUBTITLE_CACHE_MAX_FILES = int(os.getenv("SUBTITLE_CACHE_MAX_FILES", "2000"))
+
+# 웹 스크래핑 (방법 4) 자막 트랙 목록 캐시 (트랙 URL 서명이 만료되기 전까지만)
+CAPTION_TRACK_CACHE_TTL = float(os.getenv("CAPTION_TRACK_CACHE_TTL", "3600"))
+CAPTION_TRACK_CACHE_MAX_ENTRIES = int(os.getenv("CAPTION_TRACK_CACHE_MAX_ENTRIES", "2000"))
+# 선호 순서대로 내려받아 볼 최대 트랙 수
+CAPTION_TRACK_MAX_ATTEMPTS = int(os.getenv("CAPTION_TRACK_MAX_ATTEMPTS", "3"))
+
+# 자막 추출 방법 헤지 실행 설정
+# (앞 방법이 지연 시간 안에 끝나지 않거나 실패하면 다음 방법을 병렬로 시작)
+TRANSCRIPT_HEDGE_ENABLED = os.getenv("TRANSCRIPT_HEDGE_ENABLED", "true").lower() == "true"
+TRANSCRIPT_HEDGE_DELAY = float(os.getenv("TRANSCRIPT_HEDGE_DELAY", "2.0"))
+TRANSCRIPT_HEDGE_MAX_CONCURRENCY = int(os.getenv("TRANSCRIPT_HEDGE_MAX_CONCURRENCY", "2"))
+
+# 자막 추출 방법 순서 자동 조정 설정 (방법별 성공률/지연 시간 기반)
+TRANSCRIPT_RANKER_ENABLED = os.getenv("TRANSCRIPT_RANKER_ENABLED", "true").lower() == "true"
+TRANSCRIPT_RANKER_WINDOW = int(os.getenv("TRANSCRIPT_RANKER_WINDOW", "50"))
+TRANSCRIPT_RANKER_PROBE_INTERVAL = float(os.getenv("TRANSCRIPT_RANKER_PROBE_INTERVAL", "300"))
+
+# 자막을 가져올 수 없는 영상의 실패 캐시 TTL (초)
+TRANSCRIPT_NEGATIVE_TTL = int(os.getenv("TRANSCRIPT_NEGATIVE_TTL", str(6 * 3600)))
+# 요청 제한은 일시적이므로 짧게만 (0 이면 캐시하지 않음)
+TRANSCRIPT_RATE_LIMIT_TTL = int(os.getenv("TRANSCRIPT_RATE_LIMIT_TTL", "60"))
+
+# 사용할 자막 추출 방법 (쉼표로 구분, 비어 있으면 전부)
+TRANSCRIPT_METHODS_ENABLED = [name.strip() for name in os.getenv("TRANSCRIPT_METHODS", "").split(",") if name.strip()]
+
+# 여러 영상 자막 일괄 조회 설정
+TRANSCRIPT_BATCH_WORKERS = int(os.getenv("TRANSCRIPT_BATCH_WORKERS", "8"))
+TRANSCRIPT_BATCH_TIMEOUT = float(os.getenv("TRANSCRIPT_BATCH_TIMEOUT", "180"))  # 영상 하나당 (동시 실행 대기 시간 제외)
+
+# 검색 결과 캐시 설정 (TTL 이 지나도 STALE_TTL 동안은 이전 결과를 주고 백그라운드에서 갱신)
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "1800"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", str(6 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "500"))
+
+# YouTube Data API 할당량 스케줄러 설정
+YOUTUBE_QUOTA_DAILY_BUDGET = int(os.getenv("YOUTUBE_QUOTA_DAILY_BUDGET", "10000"))
+YOUTUBE_QUOTA_RATE = float(os.getenv("YOUTUBE_QUOTA_RATE", "5"))  # 초당 요청 수
+YOUTUBE_QUOTA_BURST = int(os.getenv("YOUTUBE_QUOTA_BURST", "10"))
+YOUTUBE_QUOTA_MAX_WAIT = float(os.getenv("YOUTUBE_QUOTA_MAX_WAIT", "10"))
+YOUTUBE_QUOTA_NORMAL_RESERVE = float(os.getenv("YOUTUBE_QUOTA_NORMAL_RESERVE", "0.0"))  # 높은 우선순위용 예비 비율 (HIGH 로 호출하는 곳이 없으면 0)
+YOUTUBE_QUOTA_LOW_RESERVE = float(os.getenv("YOUTUBE_QUOTA_LOW_RESERVE", "0.3"))
+
+# 비디오 메타데이터 저장소 설정 (snippet 은 길게, statistics 는 짧게 캐시)
+VIDEO_SNIPPET_TTL = float(os.getenv("VIDEO_SNIPPET_TTL", str(24 * 3600)))
+VIDEO_STATISTICS_TTL = float(os.getenv("VIDEO_STATISTICS_TTL", "600"))
+VIDEO_METADATA_MAX_ENTRIES = int(os.getenv("VIDEO_METADATA_MAX_ENTRIES", "10000"))
+
+# 채널 RSS 피드 캐시 설정 (FRESH_TTL 이내면 재검증 요청도 생략)
+FEED_CACHE_FRESH_TTL = float(os.getenv("FEED_CACHE_FRESH_TTL", "60"))
+FEED_CACHE_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "2000"))
+
+# 자막 조각 조회 시 한 번에 돌려줄 최대 글자 수
+TRANSCRIPT_CHUNK_MAX_LIMIT = int(os.getenv("TRANSCRIPT_CHUNK_MAX_LIMIT", "20000"))
+
+# 자막 전문 검색 색인 설정 (기본값은 자막 캐시와 같은 SQLite 파일)
+TRANSCRIPT_INDEX_ENABLED = os.getenv("TRANSCRIPT_INDEX_ENABLED", "true").lower() == "true"
+TRANSCRIPT_INDEX_PATH = os.getenv("TRANSCRIPT_INDEX_PATH", TRANSCRIPT_CACHE_PATH)
+TRANSCRIPT_SEARCH_MAX_RESULTS = int(os.getenv("TRANSCRIPT_SEARCH_MAX_RESULTS", "50"))
+
+# 서버 실행 방식 (stdio: 클라이언트마다 하위 프로세스, streamable-http: 여러 클라이언트가 하나의 서버 공유)
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+MCP_HTTP_HOST = os.getenv("MCP_HTTP_HOST", "127.0.0.1")
+MCP_HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "8000"))
+MCP_HTTP_WORKERS = int(os.getenv("MCP_HTTP_WORKERS", "1"))
+
+# Prometheus 텍스트 지표 엔드포인트 (/metrics, 포트를 지정할 때만 실행)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# 프로세스 간 공유 캐시 (검색 결과, 비디오 메타데이터, API 할당량 사용량) - 워커가 여러 개면 기본 사용
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "true" if MCP_HTTP_WORKERS > 1 else "false").lower() == "true"
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", TRANSCRIPT_CACHE_PATH)
+SHARED_CACHE_MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "50000"))
+
+# 기본 언어 우선순위(ko → en → 사용 가능한 자막)로 가져온 자막의 캐시 키
+DEFAULT_TRANSCRIPT_LANGUAGE = "auto"
+
+transcript_index = TranscriptIndex(TRANSCRIPT_INDEX_PATH)
+
+transcript_cache = TranscriptCache(
+    TRANSCRIPT_CACHE_PATH,
+    ttl_seconds=TRANSCRIPT_CACHE_TTL,
+    max_entries=TRANSCRIPT_CACHE_MAX_ENTRIES,
+    max_bytes=TRANSCRIPT_CACHE_MAX_BYTES,
+    # 캐시에서 삭제된 영상은 전문 검색 색인에서도 삭제 (색인은 캐시된 자막만 담음)
+    on_evict=transcript_index.remove if TRANSCRIPT_INDEX_ENABLED else None,
+    # 워커들이 같은 파일을 공유하면 실패 기록은 매번 DB 에서 확인
+    failure_memory=not SHARED_CACHE_ENABLED
+)
+
+caption_track_cache = CaptionTrackCache(ttl=CAPTION_TRACK_CACHE_TTL, maxsize=CAPTION_TRACK_CACHE_MAX_ENTRIES)
+
+yt_dlp_executor = concurrent.futures.ThreadPoolExecutor(max_workers=YT_DLP_WORKERS, thread_name_prefix="yt-dlp")
+
+subtitle_cache = SubtitleFileCache(
+    SUBTITLE_CACHE_DIR,
+    max_bytes=SUBTITLE_CACHE_MAX_BYTES,
+    max_files=SUBTITLE_CACHE_MAX_FILES
+)
+
+shared_store = SharedStore(SHARED_CACHE_PATH, max_entries=SHARED_CACHE_MAX_ENTRIES) if SHARED_CACHE_ENABLED else None
+
+search_cache = AsyncTTLCache(
+    maxsize=SEARCH_CACHE_MAX_ENTRIES,
+    ttl=SEARCH_CACHE_TTL,
+    stale_ttl=SEARCH_CACHE_STALE_TTL,
+    shared=shared_store,
+    namespace="search_ids"  # 값은 비디오 ID 목록 (이전 형식인 "search" 의 영상 정보 목록과 섞이지 않도록)
+)
+
+# 초당 요청 수는 워커끼리 나눠 가짐 (일일 예산은 공유 장부로 함께 차감)
+quota_scheduler = QuotaScheduler(
+    daily_budget=YOUTUBE_QUOTA_DAILY_BUDGET,
+    rate=YOUTUBE_QUOTA_RATE / max(MCP_HTTP_WORKERS, 1),
+    burst=max(1, YOUTUBE_QUOTA_BURST // max(MCP_HTTP_WORKERS, 1)),
+    max_wait=YOUTUBE_QUOTA_MAX_WAIT,
+    normal_reserve=YOUTUBE_QUOTA_NORMAL_RESERVE,
+    low_reserve=YOUTUBE_QUOTA_LOW_RESERVE,
+    ledger=shared_store
+)
+
+feed_cache = FeedCache(
+    fresh_ttl=FEED_CACHE_FRESH_TTL,
+    maxsize=FEED_CACHE_MAX_ENTRIES
+)
+
+method_ranker = MethodRanker(
+    window=TRANSCRIPT_RANKER_WINDOW,
+    probe_interval=TRANSCRIPT_RANKER_PROBE_INTERVAL
+)
 
 # Create an MCP server
 mcp = FastMCP("youtube_agent_server")
 
-### Tool 1 : 유튜브 영상 URL에 대한 자막을 가져옵니다 (개선된 버전)
+### 자막 추출 방법들
 
-@mcp.tool()
-def get_youtube_transcript(url: str) -> str:
-    """ 유튜브 영상 URL에 대한 자막을 가져옵니다."""
+# 자막을 가져오지 못한 사유 (방법 실패 시 상태값으로 반환)
+FAILURE_DISABLED = "disabled"          # 자막이 비활성화된 영상
+FAILURE_UNAVAILABLE = "unavailable"    # 자막이 없거나 볼 수 없는 영상
+FAILURE_RATE_LIMITED = "rate_limited"  # YouTube 요청 제한 (일시적)
+FAILURE_UNKNOWN = "unknown"            # 원인 불명 (네트워크 오류, 파싱 실패 등)
+
+# 여러 사유가 섞여 있을 때의 우선순위 - 일시적인 사유가 있으면 영구 실패로 보지 않음
+FAILURE_PRIORITY = [FAILURE_RATE_LIMITED, FAILURE_DISABLED, FAILURE_UNAVAILABLE, FAILURE_UNKNOWN]
+
+FAILURE_MESSAGES = {
+    FAILURE_DISABLED: "자막이 비활성화된 영상입니다.",
+    FAILURE_UNAVAILABLE: "자막이 없거나 접근이 제한된 영상입니다.",
+    FAILURE_RATE_LIMITED: "YouTube 요청 제한으로 자막을 가져오지 못했습니다. 잠시 후 다시 시도해주세요.",
+    FAILURE_UNKNOWN: "자막이 없거나 접근이 제한되어 있을 수 있습니다.",
+}
+
+# 실패 사유별 실패 캐시 TTL (원인 불명 실패는 캐시하지 않음)
+TRANSCRIPT_NEGATIVE_TTLS = {
+    FAILURE_DISABLED: TRANSCRIPT_NEGATIVE_TTL,
+    FAILURE_UNAVAILABLE: TRANSCRIPT_NEGATIVE_TTL,
+    FAILURE_RATE_LIMITED: TRANSCRIPT_RATE_LIMIT_TTL,
+}
+
+def merge_failure_reasons(reasons: list) -> str:
+    """여러 실패 사유 중 우선순위가 가장 높은 사유"""
+    for reason in FAILURE_PRIORITY:
+        if reason in reasons:
+            return reason
+    return FAILURE_UNKNOWN
+
+def classify_transcript_api_error(error: Exception) -> str:
+    """youtube-transcript-api 예외를 실패 사유로 변환"""
+    from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+
+    if isinstance(error, TranscriptsDisabled):
+        return FAILURE_DISABLED
+    if isinstance(error, (NoTranscriptFound, VideoUnavailable)):
+        return FAILURE_UNAVAILABLE
+    # 라이브러리 버전에 따라 요청 제한 예외 이름이 다름
+    if type(error).__name__ in ("TooManyRequests", "RequestBlocked", "IpBlocked") or "429" in str(error):
+        return FAILURE_RATE_LIMITED
+    return FAILURE_UNKNOWN
+
+def segments_from_api_entries(entries) -> TranscriptSegments:
+    """youtube-transcript-api 결과 (text/start/duration) 를 구간 목록으로 변환"""
+    return TranscriptSegments.from_entries(
+        (entry.get("start", 0), entry.get("duration", 0), entry["text"]) for entry in entries
+    )
+
+def parse_srt_segments(content: str) -> TranscriptSegments:
+    """SRT / WebVTT 자막 파일을 구간 목록으로 변환
+    (시간 정보가 없는 블록 - WEBVTT 헤더, NOTE, STYLE - 은 건너뛰고, 자동 생성 자막에서
+    앞 구간 줄이 다음 구간에 반복되는 경우는 한 번만 넣음)"""
+    def to_seconds(timestamp: str) -> float:
+        # HH:MM:SS,mmm (SRT) / HH:MM:SS.mmm, MM:SS.mmm (WebVTT)
+        seconds = 0.0
+        for part in timestamp.strip().replace(',', '.').split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+
+    entries = []
+    previous_line = None
+    # 빈 줄로만 구분 (자동 생성 자막은 구간 안에 공백만 있는 줄이 있어 공백 줄에서 나누면 시간 줄과 본문이 갈라짐)
+    for block in re.split(r'(?:\r?\n){2,}', content):
+        start = end = 0.0
+        has_timing = False
+        text_lines = []
+        for line in block.split('\n'):
+            line = line.strip()
+            if '-->' in line:
+                has_timing = True
+                try:
+                    start_text, end_text = line.split('-->')
+                    start, end = to_seconds(start_text), to_seconds(end_text.split()[0])
+                except (ValueError, IndexError):
+                    pass
+            elif has_timing and line:
+                # 서식 태그 (<i>, <c>, <00:00:01.000>) 와 HTML 엔티티 제거
+                line = html.unescape(re.sub(r'<[^>]*>', '', line)).strip()
+                if line and line != previous_line:
+                    text_lines.append(line)
+        if text_lines:
+            entries.append((start, max(end - start, 0), ' '.join(text_lines)))
+            previous_line = text_lines[-1]
+    return TranscriptSegments.from_entries(entries)
+
+def extract_video_id(url: str) -> str:
+    """YouTube URL에서 비디오 ID 추출"""
+    patterns = [
+        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
+        r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
+    ]
     
-    def extract_video_id(url: str) -> str:
-        """YouTube URL에서 비디오 ID 추출"""
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-            r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        raise ValueError("유효하지 않은 YouTube URL입니다")
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    
+    raise ValueError("유효하지 않은 YouTube URL입니다")
 
-    def method1_youtube_transcript_api(video_id: str) -> tuple:
-        """방법 1: youtube-transcript-api 사용 (최대한 간단한 버전)"""
+def _fetch_with_youtube_transcript_api(video_id: str) -> tuple:
+    """youtube-transcript-api 사용 (최대한 간단한 버전, 동기 라이브러리)"""
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    reasons = []
+    try:
+        # 모든 가능한 언어로 시도
+        all_languages = ['ko', 'en', 'en-US', 'en-GB', 'ja', 'zh', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ar', 'hi', 'th', 'vi', 'id', 'tr', 'pl', 'nl', 'sv', 'da', 'no', 'fi', 'cs', 'hu', 'ro', 'bg', 'hr', 'sk', 'sl', 'et', 'lv', 'lt', 'el', 'he', 'fa', 'ur', 'bn', 'ta', 'te', 'ml', 'kn', 'gu', 'pa', 'or', 'as', 'ne', 'si', 'my', 'km', 'lo', 'ka', 'am', 'sw', 'zu', 'af', 'sq', 'eu', 'be', 'bs', 'ca', 'cy', 'eo', 'gl', 'is', 'mk', 'mt', 'ms', 'tl', 'uk', 'uz', 'vi', 'yi']
+        
+        # 먼저 자막 목록 확인
         try:
-            # 모든 가능한 언어로 시도
-            all_languages = ['ko', 'en', 'en-US', 'en-GB', 'ja', 'zh', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ar', 'hi', 'th', 'vi', 'id', 'tr', 'pl', 'nl', 'sv', 'da', 'no', 'fi', 'cs', 'hu', 'ro', 'bg', 'hr', 'sk', 'sl', 'et', 'lv', 'lt', 'el', 'he', 'fa', 'ur', 'bn', 'ta', 'te', 'ml', 'kn', 'gu', 'pa', 'or', 'as', 'ne', 'si', 'my', 'km', 'lo', 'ka', 'am', 'sw', 'zu', 'af', 'sq', 'eu', 'be', 'bs', 'ca', 'cy', 'eo', 'gl', 'is', 'mk', 'mt', 'ms', 'tl', 'uk', 'uz', 'vi', 'yi']
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            
+            # 사용 가능한 자막들 확인
+            available_transcripts = []
+            for transcript in transcript_list:
+                available_transcripts.append(transcript.language_code)
+            
+            print(f"사용 가능한 자막 언어: {available_transcripts}", file=sys.stderr)
             
-            # 먼저 자막 목록 확인
+            # 사용 가능한 자막 중에서 우선순위 언어 시도
+            preferred_languages = ['ko', 'en', 'en-US', 'en-GB']
+            for lang in preferred_languages:
+                if lang in available_transcripts:
+                    try:
+                        transcript = transcript_list.find_transcript([lang])
+                        transcript_data = transcript.fetch()
+                        segments = segments_from_api_entries(transcript_data)
+                        if segments.text.strip():
+                            return segments, f"성공 (언어: {lang})"
+                    except Exception as e:
+                        continue
+            
+            # 첫 번째 사용 가능한 자막 시도
             try:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                
-                # 사용 가능한 자막들 확인
-                available_transcripts = []
-                for transcript in transcript_list:
-                    available_transcripts.append(transcript.language_code)
-                
-                print(f"사용 가능한 자막 언어: {available_transcripts}")
-                
-                # 사용 가능한 자막 중에서 우선순위 언어 시도
-                preferred_languages = ['ko', 'en', 'en-US', 'en-GB']
-                for lang in preferred_languages:
-                    if lang in available_transcripts:
-                        try:
-                            transcript = transcript_list.find_transcript([lang])
-                            transcript_data = transcript.fetch()
-                            text = " ".join([entry["text"] for entry in transcript_data])
-                            if text.strip():
-                                return text, f"성공 (언어: {lang})"
-                        except Exception as e:
-                            continue
-                
-                # 첫 번째 사용 가능한 자막 시도
-                try:
-                    first_transcript = next(iter(transcript_list))
-                    transcript_data = first_transcript.fetch()
-                    text = " ".join([entry["text"] for entry in transcript_data])
-                    if text.strip():
-                        return text, f"성공 (언어: {first_transcript.language_code})"
-                except Exception as e:
-                    pass
-                    
+                first_transcript = next(iter(transcript_list))
+                transcript_data = first_transcript.fetch()
+                segments = segments_from_api_entries(transcript_data)
+                if segments.text.strip():
+                    return segments, f"성공 (언어: {first_transcript.language_code})"
             except Exception as e:
-                print(f"자막 목록 조회 실패: {e}")
+                pass
                 
-            # 직접 언어별 시도
-            for lang in ['ko', 'en']:
+        except Exception as e:
+            print(f"자막 목록 조회 실패: {e}", file=sys.stderr)
+            reasons.append(classify_transcript_api_error(e))
+            
+        # 직접 언어별 시도
+        for lang in ['ko', 'en']:
+            try:
+                transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
+                segments = segments_from_api_entries(transcript)
+                if segments.text.strip():
+                    return segments, f"성공 (직접 - {lang})"
+            except Exception as e:
+                reasons.append(classify_transcript_api_error(e))
+                continue
+            
+    except Exception as e:
+        print(f"youtube-transcript-api 오류: {e}", file=sys.stderr)
+    
+    return None, merge_failure_reasons(reasons)
+
+async def method1_youtube_transcript_api(video_id: str) -> tuple:
+    """방법 1: youtube-transcript-api 사용 (동기 라이브러리이므로 별도 스레드에서 실행)"""
+    return await asyncio.to_thread(_fetch_with_youtube_transcript_api, video_id)
+
+async def method2_direct_api_call(video_id: str) -> tuple:
+    """방법 2: 직접 YouTube API 호출"""
+    import xml.etree.ElementTree as ET
+
+    try:
+        # YouTube의 자막 API 직접 호출
+        for lang in ['ko', 'en']:
+            captions_url = f"{YOUTUBE_BASE_URL}/api/timedtext?v={video_id}&lang={lang}&fmt=srv3"
+            response = await async_get(captions_url, headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            })
+            
+            if response.status_code == 429:
+                return None, FAILURE_RATE_LIMITED
+            
+            if response.status_code == 200 and response.text.strip():
                 try:
-                    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
-                    text = " ".join([entry["text"] for entry in transcript])
-                    if text.strip():
-                        return text, f"성공 (직접 - {lang})"
-                except Exception as e:
+                    root = ET.fromstring(response.text)
+                    entries = []
+                    for text_elem in root.findall('.//text'):
+                        if text_elem.text:
+                            # HTML 엔티티 디코딩
+                            clean_text = text_elem.text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+                            entries.append((text_elem.get('start', 0), text_elem.get('dur', 0), clean_text))
+                    
+                    if entries:
+                        return TranscriptSegments.from_entries(entries), f"성공 (직접 API - {lang})"
+                except ET.ParseError:
                     continue
-                
-        except Exception as e:
-            print(f"youtube-transcript-api 오류: {e}")
-        
-        return None, "실패"
+                    
+    except Exception as e:
+        pass
+    
+    return None, FAILURE_UNKNOWN
 
-    def method2_direct_api_call(video_id: str) -> tuple:
-        """방법 2: 직접 YouTube API 호출"""
+async def run_subprocess(cmd: list, timeout: float) -> tuple:
+    """asyncio 서브프로세스 실행 (시간 초과/취소 시 프로세스 종료)
+    반환값: (returncode, stdout, stderr)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except BaseException:
+        # 시간 초과 또는 헤지 실행에서 취소된 경우 프로세스를 남기지 않음
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    return (
+        process.returncode,
+        stdout.decode('utf-8', errors='ignore'),
+        stderr.decode('utf-8', errors='ignore')
+    )
+
+# yt-dlp 로 받을 자막 언어 (우선순위 순)
+YT_DLP_SUBTITLE_LANGUAGES = ["ko", "en"]
+
+class QuietYtDlpLogger:
+    """yt-dlp 출력 무시 (stdout 은 JSON-RPC 전용, 오류는 DownloadError 로 받음)"""
+    def debug(self, message):
+        pass
+
+    def info(self, message):
+        pass
+
+    def warning(self, message):
+        pass
+
+    def error(self, message):
+        pass
+
+def classify_yt_dlp_error(message: str) -> str:
+    """yt-dlp 오류 메시지를 실패 사유로 분류"""
+    if 'HTTP Error 429' in message:
+        return FAILURE_RATE_LIMITED
+    if 'Video unavailable' in message or 'Private video' in message:
+        return FAILURE_UNAVAILABLE
+    return FAILURE_UNKNOWN
+
+def pick_subtitle_file(directory: str, video_id: str):
+    """다운로드 디렉터리에서 우선순위가 가장 높은 언어의 자막 파일 선택
+    반환값: (언어, 확장자, 내용) 또는 None (파일 이름: <video_id>.<언어>.<확장자>)"""
+    names = sorted(os.listdir(directory))
+    for lang in YT_DLP_SUBTITLE_LANGUAGES:
+        for name in names:
+            parts = name.split('.')
+            if len(parts) == 3 and parts[0] == video_id and parts[1] == lang and parts[2] in ('vtt', 'srt'):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    return lang, parts[2], f.read()
+    return None
+
+def download_subtitles_in_process(video_id: str) -> tuple:
+    """yt-dlp Python API 로 자막 다운로드 (페이지 조회 한 번, yt_dlp_executor 스레드에서 실행)
+    헤지 실행에서 취소되거나 제한 시간이 지나도 스레드는 끝까지 실행되므로 임시 디렉터리 정리는 여기서 합니다.
+    반환값: ((언어, 확장자, 내용) 또는 None, 오류 메시지)"""
+    import yt_dlp  # 무거운 모듈이라 처음 사용할 때 import (없으면 ImportError)
+
+    with tempfile.TemporaryDirectory(prefix="yt_dlp_") as directory:
+        options = {
+            'skip_download': True,
+            'writesubtitles': True,
+            'writeautomaticsub': True,
+            'subtitleslangs': YT_DLP_SUBTITLE_LANGUAGES,
+            'subtitlesformat': 'vtt/srt/best',
+            'outtmpl': os.path.join(directory, '%(id)s.%(ext)s'),
+            'socket_timeout': YT_DLP_SOCKET_TIMEOUT,
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+            'logger': QuietYtDlpLogger(),
+        }
         try:
-            # YouTube의 자막 API 직접 호출
-            for lang in ['ko', 'en']:
-                captions_url = f"https://www.youtube.com/api/timedtext?v={video_id}&lang={lang}&fmt=srv3"
-                response = requests.get(captions_url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }, timeout=10)
-                
-                if response.status_code == 200 and response.text.strip():
-                    try:
-                        root = ET.fromstring(response.text)
-                        texts = []
-                        for text_elem in root.findall('.//text'):
-                            if text_elem.text:
-                                # HTML 엔티티 디코딩
-                                clean_text = text_elem.text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-                                texts.append(clean_text)
-                        
-                        if texts:
-                            return " ".join(texts), f"성공 (직접 API - {lang})"
-                    except ET.ParseError:
-                        continue
-                        
-        except Exception as e:
-            pass
-        
-        return None, "실패"
+            with yt_dlp.YoutubeDL(options) as ydl:
+                ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=True)
+        except yt_dlp.utils.DownloadError as e:
+            return None, str(e)
+        return pick_subtitle_file(directory, video_id), ""
+
+async def download_subtitles_with_cli(video_id: str) -> tuple:
+    """yt-dlp 패키지를 import 할 수 없을 때 CLI 를 한 번만 실행해 임시 디렉터리로 자막 다운로드"""
+    directory = tempfile.mkdtemp(prefix="yt_dlp_")
+    try:
+        cmd = [
+            'yt-dlp',
+            '--write-subs',
+            '--write-auto-subs',
+            '--sub-langs', ','.join(YT_DLP_SUBTITLE_LANGUAGES),
+            '--sub-format', 'vtt/srt/best',
+            '--skip-download',
+            '--socket-timeout', str(YT_DLP_SOCKET_TIMEOUT),
+            '--output', os.path.join(directory, '%(id)s.%(ext)s'),
+            f'https://www.youtube.com/watch?v={video_id}'
+        ]
+        returncode, _, stderr = await run_subprocess(cmd, timeout=YT_DLP_TIMEOUT)
+        if returncode != 0:
+            return None, stderr or "yt-dlp 실행 실패"
+        return pick_subtitle_file(directory, video_id), ""
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+async def method3_yt_dlp_extraction(video_id: str) -> tuple:
+    """방법 3: yt-dlp를 사용한 자막 추출 (받은 자막 파일은 subtitle_cache 에 보관)"""
+    try:
+        cached = await asyncio.to_thread(subtitle_cache.get, video_id)
+        if cached is not None:
+            content, lang = cached
+            segments = parse_srt_segments(content)
+            if len(segments) > 0:
+                return segments, f"성공 (yt-dlp 캐시 - {lang})"
+
+        try:
+            loop = asyncio.get_running_loop()
+            subtitle, error = await asyncio.wait_for(
+                loop.run_in_executor(yt_dlp_executor, download_subtitles_in_process, video_id),
+                timeout=YT_DLP_TIMEOUT
+            )
+        except ImportError:
+            subtitle, error = await download_subtitles_with_cli(video_id)
+
+        if subtitle is None:
+            # 오류 없이 끝났는데 파일이 없으면 한국어/영어 자막이 없는 영상
+            return None, classify_yt_dlp_error(error) if error else FAILURE_UNAVAILABLE
+
+        lang, ext, data = subtitle
+        await asyncio.to_thread(subtitle_cache.put, video_id, lang, ext, data)
+        segments = parse_srt_segments(data.decode('utf-8', errors='ignore'))
+        if len(segments) > 0:
+            return segments, f"성공 (yt-dlp - {lang})"
+
+    except Exception as e:
+        pass
+
+    return None, FAILURE_UNKNOWN
+
+WEB_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+async def fetch_caption_tracks(video_id: str) -> tuple:
+    """시청 페이지의 ytInitialPlayerResponse 에서 자막 트랙 목록 조회 (비디오별 캐시)
+    반환값: (재생 가능 여부, 트랙 목록, 캐시 사용 여부) - 페이지를 읽을 수 없으면 (None, 실패 사유, False)"""
+    cached = caption_track_cache.get(video_id)
+    if cached is not None:
+        playable, tracks = cached
+        return playable, tracks, True
+
+    response = await async_get(f"{YOUTUBE_BASE_URL}/watch?v={video_id}", headers={'User-Agent': WEB_USER_AGENT}, timeout=15)
+    if response.status_code == 429:
+        return None, FAILURE_RATE_LIMITED, False
+    if response.status_code != 200:
+        return None, FAILURE_UNKNOWN, False
+
+    player_response = find_player_response(response.text)
+    if player_response is None:
+        return None, FAILURE_UNKNOWN, False
+
+    playable, tracks = is_playable(player_response), caption_tracks(player_response)
+    caption_track_cache.put(video_id, playable, tracks)
+    return playable, tracks, False
+
+async def download_caption_track(track: dict):
+    """자막 트랙 XML (<text start dur>) 을 받아 구간 목록으로 변환 (요청 제한이면 FAILURE_RATE_LIMITED, 실패하면 None)"""
+    import xml.etree.ElementTree as ET
+
+    caption_response = await async_get(urllib.parse.urljoin(YOUTUBE_BASE_URL + "/", track['baseUrl']), headers={'User-Agent': WEB_USER_AGENT})
+    if caption_response.status_code == 429:
+        return FAILURE_RATE_LIMITED
+    if caption_response.status_code != 200 or not caption_response.text.strip():
+        return None
+    try:
+        root = ET.fromstring(caption_response.text)
+    except ET.ParseError:
+        return None
+    entries = []
+    for text_elem in root.findall('.//text'):
+        if text_elem.text:
+            # 자막 본문은 한 번 더 HTML 이스케이프되어 있음 (&amp;#39; 등)
+            entries.append((text_elem.get('start', 0), text_elem.get('dur', 0), html.unescape(text_elem.text)))
+    segments = TranscriptSegments.from_entries(entries)
+    if entries and len(segments.text.strip()) > 10:  # 최소 길이 체크
+        return segments
+    return None
+
+async def method4_web_scraping(video_id: str) -> tuple:
+    """방법 4: 웹 스크래핑을 통한 자막 추출
+    시청 페이지의 플레이어 응답에서 트랙 목록을 한 번에 읽고, 선호 언어(한국어 → 영어)/종류 순으로 정렬한 트랙부터 내려받습니다.
+    트랙 목록은 비디오별로 캐시되므로 자막 캐시에 없는 영상을 다시 조회할 때는 페이지를 다시 받지 않습니다."""
+    try:
+        while True:
+            playable, tracks, from_cache = await fetch_caption_tracks(video_id)
+            if playable is None:
+                return None, tracks
+            if not playable:
+                return None, FAILURE_UNAVAILABLE
+            if not tracks:
+                return None, FAILURE_DISABLED
+
+            for track in rank_caption_tracks(tracks)[:CAPTION_TRACK_MAX_ATTEMPTS]:
+                segments = await download_caption_track(track)
+                if isinstance(segments, str):
+                    return None, FAILURE_RATE_LIMITED
+                if segments is not None:
+                    kind = "자동 생성" if track['kind'] == "asr" else "직접 등록"
+                    return segments, f"성공 (웹 스크래핑 - {track['languageCode']}, {kind})"
+
+            if not from_cache:
+                break
+            # 캐시된 트랙 URL 이 만료되었을 수 있으므로 페이지를 다시 받아 한 번 더 시도
+            caption_track_cache.invalidate(video_id)
+
+    except Exception:
+        pass
+
+    return None, FAILURE_UNKNOWN
+
+def has_transcript(segments) -> bool:
+    return bool(segments and len(segments.text.strip()) > 0)
+
+async def run_method(method, video_id: str) -> tuple:
+    """자막 추출 방법 하나를 실행하고 결과와 소요 시간을 기록 (취소된 경우는 순위 통계에 기록하지 않음)"""
+    started = time.monotonic()
+    with metrics_registry.measure("transcript_method", method.__name__) as observation:
+        try:
+            segments, status = await method(video_id)
+        except Exception:
+            method_ranker.record(method.__name__, False, time.monotonic() - started)
+            raise
+        success = has_transcript(segments)
+        if not success:
+            # 실패 사유 (disabled, unavailable, rate_limited, unknown) 별로 집계
+            observation.fail(status)
+    method_ranker.record(method.__name__, success, time.monotonic() - started)
+    return segments, status
+
+async def run_transcript_methods(video_id: str, methods: list) -> tuple:
+    """자막 추출 방법들을 헤지(hedged) 방식으로 실행
+
+    첫 번째 방법을 시작하고, TRANSCRIPT_HEDGE_DELAY 초 안에 끝나지 않거나 실패하면
+    다음 방법을 추가로 시작합니다 (동시에 최대 TRANSCRIPT_HEDGE_MAX_CONCURRENCY 개).
+    가장 먼저 성공한 결과를 반환하고 나머지 작업은 취소합니다.
+    반환값: (자막 구간, 상태, 성공한 방법) - 모두 실패하면 (None, 실패 사유, None)
+    """
+    reasons = []
+    if not methods:
+        # 모든 방법이 꺼져 있으면 (TRANSCRIPT_METHODS) 시도할 방법 없음 - 원인 불명 실패는 캐시되지 않음
+        return None, FAILURE_UNKNOWN, None
+
+    if not TRANSCRIPT_HEDGE_ENABLED or TRANSCRIPT_HEDGE_MAX_CONCURRENCY <= 1:
+        # 순차 실행 (기존 방식)
+        for method in methods:
+            try:
+                segments, status = await run_method(method, video_id)
+                if has_transcript(segments):
+                    return segments, status, method
+                reasons.append(status)
+            except Exception:
+                reasons.append(FAILURE_UNKNOWN)
+                continue
+        return None, merge_failure_reasons(reasons), None
+
+    pending = list(methods)
+    running = {}
+
+    def launch_next():
+        method = pending.pop(0)
+        running[asyncio.create_task(run_method(method, video_id))] = method
+
+    try:
+        launch_next()
+        while running:
+            can_hedge = pending and len(running) < TRANSCRIPT_HEDGE_MAX_CONCURRENCY
+            done, _ = await asyncio.wait(list(running), timeout=TRANSCRIPT_HEDGE_DELAY if can_hedge else None, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # 헤지 지연 시간 초과 - 다음 방법을 병렬로 시작
+                launch_next()
+                continue
+
+            for task in done:
+                method = running.pop(task)
+                try:
+                    segments, status = task.result()
+                except Exception:
+                    reasons.append(FAILURE_UNKNOWN)
+                    continue
+                if has_transcript(segments):
+                    return segments, status, method
+                reasons.append(status)
+
+            # 실패한 방법이 있으면 지연 없이 다음 방법 시작
+            while pending and len(running) < TRANSCRIPT_HEDGE_MAX_CONCURRENCY:
+                launch_next()
+
+        return None, merge_failure_reasons(reasons), None
+    finally:
+        # 아직 실행 중인 방법 취소 (yt-dlp CLI 프로세스도 함께 종료됨, 스레드에서 실행 중인 yt-dlp 추출은 끝난 뒤 정리됨)
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+# 기본 시도 순서
+TRANSCRIPT_METHODS_ALL = [
+    method1_youtube_transcript_api,
+    method4_web_scraping,
+    method2_direct_api_call,
+    method3_yt_dlp_extraction
+]
+
+# TRANSCRIPT_METHODS 로 사용할 방법만 지정 가능 (예: "method2,method4" - 스텁 서버로 벤치마크할 때)
+TRANSCRIPT_METHODS = [
+    method for method in TRANSCRIPT_METHODS_ALL
+    if not TRANSCRIPT_METHODS_ENABLED or method.__name__.split("_")[0] in TRANSCRIPT_METHODS_ENABLED
+]
+
+async def index_transcript(video_id: str, segments: TranscriptSegments, only_missing: bool = False):
+    """가져온 자막을 전문 검색 색인에 추가 (실패해도 자막 조회에는 영향 없음)
+    only_missing=True 면 이미 색인된 영상은 건너뜀 (색인 확인도 DB 를 열 수 있으므로 같은 스레드에서)"""
+    if not TRANSCRIPT_INDEX_ENABLED or not transcript_index.available:
+        return
+    try:
+        add = transcript_index.add_if_missing if only_missing else transcript_index.add
+        await asyncio.to_thread(add, video_id, segments)
+    except Exception as e:
+        print(f"자막 색인 저장 오류: {e}", file=sys.stderr)
+
+async def load_transcript(video_id: str) -> tuple:
+    """캐시 확인 후 자막 추출 방법들을 실행해 자막을 가져옵니다
+    반환값: (TranscriptSegments, None) 또는 실패 시 (None, 실패 사유)
+    """
+    # 자막을 가져올 수 없다고 확인된 영상은 바로 실패 처리
+    try:
+        failure = await asyncio.to_thread(transcript_cache.get_failure, video_id)
+        if failure:
+            return None, failure["reason"]
+    except Exception as e:
+        print(f"자막 실패 캐시 조회 오류: {e}", file=sys.stderr)
+    
+    # 캐시 확인 (같은 영상의 자막은 바뀌지 않으므로 재사용)
+    try:
+        cached = await asyncio.to_thread(transcript_cache.get, video_id, DEFAULT_TRANSCRIPT_LANGUAGE)
+        if cached:
+            segments = TranscriptSegments.from_bytes(cached["transcript"], cached.get("segments"))
+            # 색인 기능 추가 전에 캐시된 자막
+            await index_transcript(video_id, segments, only_missing=True)
+            return segments, None
+    except Exception as e:
+        print(f"자막 캐시 조회 오류: {e}", file=sys.stderr)
+    
+    # 여러 방법 시도 (관측된 성공률/지연 시간 기준으로 정렬, 통계가 없으면 간단한 방법부터)
+    methods = list(TRANSCRIPT_METHODS)
+    if TRANSCRIPT_RANKER_ENABLED:
+        methods = method_ranker.order(methods)
     
-    def method3_yt_dlp_extraction(video_id: str) -> tuple:
-        """방법 3: yt-dlp를 사용한 자막 추출"""
+    segments, status, method = await run_transcript_methods(video_id, methods)
+    if segments:
         try:
-            import subprocess
-            import json
-            
-            # yt-dlp로 자막 정보 가져오기
-            cmd = [
-                'yt-dlp',
-                '--list-subs',
-                '--no-download',
-                f'https://www.youtube.com/watch?v={video_id}'
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and 'ko' in result.stdout:
-                # 한국어 자막이 있으면 다운로드
-                download_cmd = [
-                    'yt-dlp',
-                    '--write-subs',
-                    '--write-auto-subs',
-                    '--sub-langs', 'ko,en',
-                    '--skip-download',
-                    '--output', f'{video_id}.%(ext)s',
-                    f'https://www.youtube.com/watch?v={video_id}'
-                ]
-                
-                download_result = subprocess.run(download_cmd, capture_output=True, text=True, timeout=60)
-                
-                if download_result.returncode == 0:
-                    # 다운로드된 자막 파일 찾기
-                    import glob
-                    srt_files = glob.glob(f'{video_id}*.srt')
-                    if srt_files:
-                        with open(srt_files[0], 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        # SRT 파일 정리
-                        lines = content.split('\n')
-                        text_lines = []
-                        for line in lines:
-                            if line and not line.isdigit() and '-->' not in line:
-                                text_lines.append(line.strip())
-                        if text_lines:
-                            return ' '.join(text_lines), "성공 (yt-dlp)"
-                            
+            await asyncio.to_thread(
+                transcript_cache.put, video_id, DEFAULT_TRANSCRIPT_LANGUAGE, segments.text,
+                method.__name__, status, segments.to_bytes()
+            )
         except Exception as e:
-            pass
-        
-        return None, "실패"
+            print(f"자막 캐시 저장 오류: {e}", file=sys.stderr)
+        await index_transcript(video_id, segments)
+        return segments, None
     
-    def method4_web_scraping(video_id: str) -> tuple:
-        """방법 4: 웹 스크래핑을 통한 자막 추출 (개선된 버전)"""
+    # 실패 사유별로 짧은 TTL 동안 캐시 (원인 불명 실패는 캐시하지 않음)
+    reason = status
+    ttl = TRANSCRIPT_NEGATIVE_TTLS.get(reason, 0)
+    if ttl > 0:
         try:
-            import re
-            import urllib.parse
-            
-            # YouTube 페이지에서 자막 정보 추출
-            page_url = f"https://www.youtube.com/watch?v={video_id}"
-            response = requests.get(page_url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }, timeout=15)
-            
-            if response.status_code == 200:
-                # 다양한 자막 URL 패턴 시도
-                patterns = [
-                    r'"captions":\{"playerCaptionsTracklistRenderer":\{"captionTracks":\[(.*?)\]',
-                    r'"captionTracks":\[(.*?)\]',
-                    r'"captions":\{"playerCaptionsTracklistRenderer":\{"captionTracks":\[(.*?)\]\}',
-                ]
-                
-                for pattern in patterns:
-                    match = re.search(pattern, response.text)
-                    if match:
-                        captions_data = match.group(1)
-                        
-                        # URL 추출 패턴들
-                        url_patterns = [
-                            r'"baseUrl":"([^"]+)"',
-                            r'"url":"([^"]+)"',
-                            r'"baseUrl":"([^"]*timedtext[^"]*)"'
-                        ]
-                        
-                        for url_pattern in url_patterns:
-                            urls = re.findall(url_pattern, captions_data)
-                            
-                            for url in urls:
-                                try:
-                                    # URL 디코딩
-                                    decoded_url = urllib.parse.unquote(url)
-                                    
-                                    # 자막 다운로드
-                                    caption_response = requests.get(decoded_url, headers={
-                                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                                    }, timeout=10)
-                                    
-                                    if caption_response.status_code == 200 and caption_response.text.strip():
-                                        try:
-                                            root = ET.fromstring(caption_response.text)
-                                            texts = []
-                                            for text_elem in root.findall('.//text'):
-                                                if text_elem.text:
-                                                    clean_text = text_elem.text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"').replace('&#39;', "'")
-                                                    texts.append(clean_text)
-                                            
-                                            if texts and len(' '.join(texts).strip()) > 10:  # 최소 길이 체크
-                                                return " ".join(texts), "성공 (웹 스크래핑)"
-                                        except ET.ParseError:
-                                            continue
-                                        except Exception:
-                                            continue
-                                except Exception:
-                                    continue
-                        
+            await asyncio.to_thread(transcript_cache.put_failure, video_id, reason, FAILURE_MESSAGES[reason], ttl)
         except Exception as e:
-            pass
-        
-        return None, "실패"
+            print(f"자막 실패 캐시 저장 오류: {e}", file=sys.stderr)
+    
+    return None, reason
+
+def transcript_unavailable_message(video_id: str, reason: str = FAILURE_UNKNOWN) -> str:
+    return f"비디오 ID '{video_id}'의 자막을 가져올 수 없습니다. {FAILURE_MESSAGES.get(reason, FAILURE_MESSAGES[FAILURE_UNKNOWN])}"
+
+### Tool 1 : 유튜브 영상 URL에 대한 자막을 가져옵니다 (개선된 버전)
+
+@mcp.tool()
+async def get_youtube_transcript(url: str, structured: bool = False) -> str | dict:
+    """ 유튜브 영상 URL에 대한 자막을 가져옵니다.
+    structured=True 이면 구간별 시작/길이(밀리초)와 텍스트 위치 배열을 함께 반환합니다.
+    (자막이 있으면 텍스트 또는 구간 정보, 없으면 isError/reason 이 담긴 오류 객체)"""
     
     # 메인 로직
     try:
         video_id = extract_video_id(url)
         
-        # 여러 방법 시도 (간단한 방법부터)
-        methods = [
-            method1_youtube_transcript_api,
-            method4_web_scraping,
-            method2_direct_api_call,
-            method3_yt_dlp_extraction
-        ]
-        
-        for method in methods:
-            try:
-                transcript, status = method(video_id)
-                if transcript and len(transcript.strip()) > 0:
-                    return transcript
-            except Exception as e:
-                continue
+        segments, reason = await load_transcript(video_id)
+        if segments:
+            if structured:
+                return {"videoId": video_id, **segments.to_dict()}
+            return segments.text
         
         # 모든 방법 실패 - 오류 대신 빈 결과 반환
         return {
             "content": [],
             "isError": True,
-            "errorMessage": f"비디오 ID '{video_id}'의 자막을 가져올 수 없습니다. 자막이 없거나 접근이 제한되어 있을 수 있습니다."
+            "reason": reason,
+            "errorMessage": transcript_unavailable_message(video_id, reason)
         }
         
     except Exception as e:
@@ -279,65 +814,313 @@ def get_youtube_transcript(url: str) -> str:
             "errorMessage": f"자막 추출 중 오류 발생: {str(e)}"
         }
 
+### Tool 1-2 : 여러 유튜브 영상 URL의 자막을 한 번에 가져옵니다
+@mcp.tool()
+async def get_youtube_transcripts(urls: list[str]) -> list:
+    """여러 유튜브 영상 URL의 자막을 한 번에 가져옵니다 (같은 영상은 한 번만 조회)"""
+    results = []
+    video_ids = []
+    entries = {}
+
+    # URL → 비디오 ID 변환 및 중복 제거 (입력 순서 유지)
+    for url in urls:
+        try:
+            video_id = extract_video_id(url)
+        except ValueError as e:
+            results.append({"url": url, "isError": True, "errorMessage": str(e)})
+            continue
+        if video_id in entries:
+            continue
+        entry = {"videoId": video_id, "url": f"https://www.youtube.com/watch?v={video_id}"}
+        entries[video_id] = entry
+        video_ids.append(video_id)
+        results.append(entry)
+
+    if not video_ids:
+        return results
+
+    # 영상별로 독립적으로 조회 (느린 영상이 다른 영상을 막지 않도록 동시 실행 수만 제한)
+    semaphore = asyncio.Semaphore(TRANSCRIPT_BATCH_WORKERS)
+
+    async def load_with_limit(video_id: str):
+        # 제한 시간은 실행 슬롯을 얻은 뒤부터 영상마다 따로 적용 (차례를 기다린 시간은 포함하지 않음)
+        async with semaphore:
+            return await asyncio.wait_for(load_transcript(video_id), timeout=TRANSCRIPT_BATCH_TIMEOUT)
+
+    outcomes = await asyncio.gather(*[load_with_limit(video_id) for video_id in video_ids], return_exceptions=True)
+
+    for video_id, outcome in zip(video_ids, outcomes):
+        entry = entries[video_id]
+        if isinstance(outcome, asyncio.TimeoutError):
+            # 제한 시간 안에 끝나지 않은 영상은 개별 오류로 표시
+            entry.update({"isError": True, "errorMessage": f"자막 추출 시간 초과 ({TRANSCRIPT_BATCH_TIMEOUT}초)"})
+            continue
+        if isinstance(outcome, BaseException):
+            entry.update({"isError": True, "errorMessage": f"자막 추출 중 오류 발생: {str(outcome)}"})
+            continue
+        segments, reason = outcome
+        if segments:
+            entry["transcript"] = segments.text
+        else:
+            entry.update({"isError": True, "reason": reason, "errorMessage": transcript_unavailable_message(video_id, reason)})
+
+    return results
+
+def encode_transcript_cursor(video_id: str, offset: int, limit: int, start_time: float = None, end_time: float = None) -> str:
+    """다음 조각 위치를 담은 커서 (URL-safe base64 JSON, 시간 구간을 지정했으면 함께 저장)"""
+    data = {"v": video_id, "o": offset, "l": limit}
+    if start_time is not None:
+        data["s"] = start_time
+    if end_time is not None:
+        data["e"] = end_time
+    payload = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_transcript_cursor(cursor: str) -> tuple:
+    """커서 해석 - (video_id, offset, limit, start_time, end_time)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        return payload["v"], int(payload["o"]), int(payload["l"]), payload.get("s"), payload.get("e")
+    except Exception:
+        raise ValueError("유효하지 않은 커서입니다.")
+
+def slice_transcript(transcript: str, offset: int, limit: int) -> tuple:
+    """offset 부터 최대 limit 글자를 잘라냄 (단어 중간에서 끊기지 않도록 마지막 공백까지)
+    반환값: (조각, 다음 offset 또는 None)
+    """
+    end = offset + limit
+    if end >= len(transcript):
+        return transcript[offset:], None
+    # 조각 뒤쪽 20% 안에 공백이 있으면 그 위치에서 자름
+    space = transcript.rfind(" ", offset + int(limit * 0.8), end)
+    if space > offset:
+        end = space + 1
+    return transcript[offset:end], end
+
+### Tool 1-3 : 유튜브 영상 자막을 조각 단위로 가져옵니다
+@mcp.tool()
+async def get_youtube_transcript_chunk(url: str = "", offset: int = 0, limit: int = 4000, cursor: str = "",
+                                       start_time: float | None = None, end_time: float | None = None,
+                                       structured: bool = False) -> dict:
+    """유튜브 영상 자막을 offset 위치부터 최대 limit 글자씩 가져옵니다.
+    start_time/end_time(초)을 주면 그 시간 구간의 자막 안에서 조각을 나눕니다 (타이밍 정보가 있는 자막만).
+    structured=True 이면 조각에 포함된 구간의 시작/길이(밀리초) 배열을 함께 반환합니다.
+    응답의 nextCursor 를 cursor 로 넘기면 다음 조각을 가져옵니다 (cursor 를 주면 나머지 인자는 무시)."""
+    try:
+        if cursor:
+            video_id, offset, limit, start_time, end_time = decode_transcript_cursor(cursor)
+        else:
+            video_id = extract_video_id(url)
+
+        limit = max(1, min(limit, TRANSCRIPT_CHUNK_MAX_LIMIT))
+        offset = max(0, offset)
+
+        # 전체 자막은 캐시에서 (처음 한 번만 추출)
+        segments, reason = await load_transcript(video_id)
+        if not segments:
+            return {
+                "videoId": video_id,
+                "isError": True,
+                "reason": reason,
+                "errorMessage": transcript_unavailable_message(video_id, reason)
+            }
+
+        timed = start_time is not None or end_time is not None
+        if timed:
+            if not segments.has_timing:
+                return {
+                    "videoId": video_id,
+                    "isError": True,
+                    "errorMessage": "이 자막에는 타이밍 정보가 없어 시간 구간으로 가져올 수 없습니다."
+                }
+            segments = segments.slice_time(start_time, end_time)
+
+        text, next_offset = slice_transcript(segments.text, offset, limit)
+        result = {
+            "videoId": video_id,
+            "offset": offset,
+            "text": text,
+            "totalLength": len(segments.text),
+            "hasMore": next_offset is not None,
+            "nextCursor": encode_transcript_cursor(video_id, next_offset, limit, start_time, end_time) if next_offset is not None else None
+        }
+        if timed:
+            result.update({"startTime": start_time, "endTime": end_time})
+        if structured and segments.has_timing:
+            first, last = segments.text_index_range(offset, offset + len(text))
+            chunk = segments.slice(first, last)
+            result.update({"start": chunk.starts.tolist(), "duration": chunk.durations.tolist()})
+        return result
+
+    except Exception as e:
+        return {
+            "isError": True,
+            "errorMessage": f"자막 추출 중 오류 발생: {str(e)}"
+        }
+
+### Tool 1-4 : 지금까지 가져온 자막에서 문구를 검색합니다
+@mcp.tool()
+async def search_transcripts(query: str, max_results: int = 10) -> dict:
+    """지금까지 가져온 유튜브 자막에서 검색어가 포함된 영상을 관련도 순으로 찾습니다.
+    여러 단어를 입력하면 모든 단어가 영상 자막 어딘가에 나오는 영상을 찾습니다 (한 문장 안에 함께 있을 필요 없음).
+    영상마다 일치한 부분([ ] 로 표시)과 영상 내 시작 시각(초, 타이밍 정보가 없으면 null)을 함께 반환합니다."""
+    try:
+        if not TRANSCRIPT_INDEX_ENABLED or not transcript_index.available:
+            return {"isError": True, "errorMessage": "자막 검색 색인을 사용할 수 없습니다."}
+        if not query.strip():
+            return {"isError": True, "errorMessage": "검색어를 입력해 주세요."}
+
+        max_results = max(1, min(max_results, TRANSCRIPT_SEARCH_MAX_RESULTS))
+        results = await asyncio.to_thread(transcript_index.search, query, max_results)
+        for result in results:
+            result["url"] = f"https://www.youtube.com/watch?v={result['videoId']}"
+        return {"query": query, "results": results}
+
+    except Exception as e:
+        return {
+            "isError": True,
+            "errorMessage": f"자막 검색 중 오류 발생: {str(e)}"
+        }
+
+### YouTube Data API 호출
+
+async def youtube_api_get(endpoint: str, query: str, priority: int = PRIORITY_NORMAL) -> dict:
+    """할당량 스케줄러를 거쳐 YouTube Data API 호출 (endpoint: search, videos, channels)"""
+    with metrics_registry.measure("youtube_api", endpoint) as observation:
+        try:
+            await quota_scheduler.acquire(endpoint, priority)
+        except QuotaExceededError:
+            # 요청을 보내기 전에 거절됨 - 지연 시간 히스토그램에서 제외
+            observation.fail("quota_rejected", observe=False)
+            raise
+        observation.restart()
+        response = await async_get(f"{YOUTUBE_API_URL}/{endpoint}?{query}&key={YOUTUBE_API_KEY}")
+        if response.status_code == 403 and 'quotaExceeded' in response.text:
+            observation.fail("quota_exceeded")
+            await asyncio.to_thread(quota_scheduler.mark_exhausted)
+            raise QuotaExceededError("YouTube API 일일 할당량이 모두 소진되었습니다.")
+        if response.status_code >= 400:
+            observation.fail(f"http_{response.status_code}")
+        response.raise_for_status()
+        return response.json()
+
+async def fetch_video_items(video_ids: list, parts: tuple, priority: int = PRIORITY_NORMAL) -> list:
+    """videos.list 호출 (최대 50개 ID)"""
+    data = await youtube_api_get("videos", f"part={','.join(parts)}&id={','.join(video_ids)}&maxResults=50", priority)
+    return data.get('items', [])
+
+video_metadata = VideoMetadataStore(
+    fetch_video_items,
+    ttls={"snippet": VIDEO_SNIPPET_TTL, "statistics": VIDEO_STATISTICS_TTL},
+    maxsize=VIDEO_METADATA_MAX_ENTRIES,
+    batch_size=50,
+    shared=shared_store
+)
+
+def normalize_search_query(query: str) -> str:
+    """검색 캐시 키용 검색어 정규화 (유니코드 정규화, 소문자, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+async def fetch_search_video_ids(query: str, max_results: int, priority: int = PRIORITY_NORMAL) -> list:
+    """YouTube Data API 로 동영상 검색 (검색 결과 순서대로 비디오 ID 목록)"""
+    search_data = await youtube_api_get(
+        "search",
+        f"part=snippet&q={urllib.parse.quote(query)}&type=video&maxResults={max_results}",
+        priority
+    )
+    return [item['id']['videoId'] for item in search_data.get('items', [])]
+
+async def fetch_video_cards(video_ids: list, priority: int = PRIORITY_NORMAL) -> list:
+    """비디오 ID 목록의 세부 정보 (캐시에 없는 영상만 videos.list 로 조회)"""
+    if not video_ids:
+        return []
+
+    details = await video_metadata.get_many(video_ids, ("snippet", "statistics"), priority)
+
+    videos = []
+    for item in (details[video_id] for video_id in video_ids if video_id in details):
+        snippet = item.get('snippet', {})
+        statistics = item.get('statistics', {})
+        thumbnails = snippet.get('thumbnails', {})
+        high_thumbnail = thumbnails.get('high', {}) 
+        view_count = statistics.get('viewCount')
+        like_count = statistics.get('likeCount')
+
+        video_card = {
+            "title": snippet.get('title', 'N/A'),
+            "publishedDate": snippet.get('publishedAt', ''),
+            "channelName": snippet.get('channelTitle', 'N/A'),
+            "channelId": snippet.get('channelId', ''),
+            "thumbnailUrl": high_thumbnail.get('url', ''),
+            "viewCount": int(view_count) if view_count is not None and view_count.isdigit() else 0,
+            "likeCount": int(like_count) if like_count is not None and like_count.isdigit() else 0,
+            "url": f"https://www.youtube.com/watch?v={item.get('id', '')}",
+        }
+        videos.append(video_card)
+
+    return videos
+
 ### Tool 2 : 유튜브에서 특정 키워드로 동영상을 검색하고 세부 정보를 가져옵니다
 @mcp.tool()
-def search_youtube_videos(query: str) -> list:
+async def search_youtube_videos(query: str) -> list:
     """유튜브에서 특정 키워드로 동영상을 검색하고 세부 정보를 가져옵니다"""
     try:
         if not YOUTUBE_API_KEY:
             raise ValueError("YouTube API 키가 설정되지 않았습니다.")
             
-        # 1. 동영상 검색
         max_results: int = 20
-        search_url = f"{YOUTUBE_API_URL}/search?part=snippet&q={requests.utils.quote(query)}&type=video&maxResults={max_results}&key={YOUTUBE_API_KEY}"
-
-        search_response = requests.get(search_url, timeout=10)
-        search_response.raise_for_status()
-        search_data = search_response.json()
         
-        video_ids = [item['id']['videoId'] for item in search_data.get('items', [])]
-
-        if not video_ids:
-            return []
+        # 같은 검색어는 캐시에서 응답 (search.list 호출마다 할당량 100 단위 소모)
+        # 백그라운드 갱신은 낮은 우선순위로 요청해 할당량이 부족하면 이전 결과를 계속 사용
+        # 검색 캐시에는 비디오 ID 만 두고, 조회수/좋아요 수는 매번 메타데이터 저장소에서 가져옴 (VIDEO_STATISTICS_TTL 적용)
+        cache_key = (normalize_search_query(query), max_results)
+        video_ids = await search_cache.get_or_load(
+            cache_key,
+            lambda: fetch_search_video_ids(query, max_results),
+            refresh_loader=lambda: fetch_search_video_ids(query, max_results, PRIORITY_LOW)
+        )
+        return await fetch_video_cards(video_ids)
 
-        video_details_url = f"{YOUTUBE_API_URL}/videos?part=snippet,statistics&id={','.join(video_ids)}&key={YOUTUBE_API_KEY}"
-        details_response = requests.get(video_details_url, timeout=10)
-        details_response.raise_for_status()
-        details_data = details_response.json()
-
-        videos = []
-        for item in details_data.get('items', []):
-            snippet = item.get('snippet', {})
-            statistics = item.get('statistics', {})
-            thumbnails = snippet.get('thumbnails', {})
-            high_thumbnail = thumbnails.get('high', {}) 
-            view_count = statistics.get('viewCount')
-            like_count = statistics.get('likeCount')
-
-            video_card = {
-                "title": snippet.get('title', 'N/A'),
-                "publishedDate": snippet.get('publishedAt', ''),
-                "channelName": snippet.get('channelTitle', 'N/A'),
-                "channelId": snippet.get('channelId', ''),
-                "thumbnailUrl": high_thumbnail.get('url', ''),
-                "viewCount": int(view_count) if view_count is not None and view_count.isdigit() else 0,
-                "likeCount": int(like_count) if like_count is not None and like_count.isdigit() else 0,
-                "url": f"https://www.youtube.com/watch?v={item.get('id', '')}",
-            }
-            videos.append(video_card)
-
-        return videos
-
-    except requests.exceptions.RequestException as e:
+    except QuotaExceededError as e:
+        raise RuntimeError(f"YouTube API 할당량 제한: {str(e)}")
+    except httpx.HTTPError as e:
         raise RuntimeError(f"YouTube API 요청 오류: {str(e)}")
     except Exception as e:
         raise RuntimeError(f"검색 중 오류 발생: {str(e)}")
 
+async def fetch_recent_videos(channel_id: str) -> list:
+    """채널의 최근 영상 목록 (오류 시 빈 목록)"""
+    try:
+        # 채널 피드는 조건부 요청으로 재검증 (변경이 없으면 이전 파싱 결과 재사용)
+        return await feed_cache.get_recent_videos(channel_id)
+    except Exception as e:
+        print(f"RSS 피드 오류: {str(e)}", file=sys.stderr)
+        return []
+
+async def fetch_channel_items(channel_ids: list, priority: int = PRIORITY_NORMAL) -> dict:
+    """channels.list 를 최대 50개 ID 씩 묶어 호출 (channel_id -> item)"""
+    batches = [channel_ids[i:i + 50] for i in range(0, len(channel_ids), 50)]
+    responses = await asyncio.gather(*[
+        youtube_api_get("channels", f"part=snippet,statistics&id={','.join(batch)}&maxResults=50", priority)
+        for batch in batches
+    ])
+    return {item['id']: item for data in responses for item in data.get('items', [])}
+
+def build_channel_info(channel_id: str, channel_info: dict, videos: list) -> dict:
+    return {
+        'channelTitle': channel_info['snippet'].get('title', 'N/A'),
+        'channelUrl': f"https://www.youtube.com/channel/{channel_id}",
+        'subscriberCount': channel_info['statistics'].get('subscriberCount', '0'),
+        'viewCount': channel_info['statistics'].get('viewCount', '0'),
+        'videoCount': channel_info['statistics'].get('videoCount', '0'),
+        'videos': videos
+    }
+
 ### Tool 3 : YouTube 동영상 URL로부터 채널 정보와 최근 5개의 동영상을 가져옵니다
 @mcp.tool()
-def get_channel_info(video_url: str) -> dict:
+async def get_channel_info(video_url: str) -> dict:
     """YouTube 동영상 URL로부터 채널 정보와 최근 5개의 동영상을 가져옵니다"""
-    
     def extract_video_id(url):
         patterns = [
             r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
@@ -350,35 +1133,6 @@ def get_channel_info(video_url: str) -> dict:
                 return match.group(1)
         return None
 
-    def fetch_recent_videos(channel_id):
-        rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-        try:
-            response = requests.get(rss_url, timeout=10)
-            if response.status_code != 200:
-                return []
-
-            root = ET.fromstring(response.text)
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            videos = []
-
-            for entry in root.findall('.//atom:entry', ns)[:5]:  
-                title_elem = entry.find('./atom:title', ns)
-                link_elem = entry.find('./atom:link', ns)
-                published_elem = entry.find('./atom:published', ns)
-                
-                if title_elem is not None and link_elem is not None and published_elem is not None:
-                    videos.append({
-                        'title': title_elem.text or '',
-                        'link': link_elem.attrib.get('href', ''),
-                        'published': published_elem.text or '',
-                        'updatedDate': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    })
-
-            return videos
-        except Exception as e:
-            print(f"RSS 피드 오류: {str(e)}")
-            return []
-
     try:
         if not YOUTUBE_API_KEY:
             raise ValueError("YouTube API 키가 설정되지 않았습니다.")
@@ -387,41 +1141,150 @@ def get_channel_info(video_url: str) -> dict:
         if not video_id:
             raise ValueError("유효하지 않은 YouTube URL입니다.")
 
-        video_api = f"{YOUTUBE_API_URL}/videos?part=snippet,statistics&id={video_id}&key={YOUTUBE_API_KEY}"
-        video_response = requests.get(video_api, timeout=10)
-        video_response.raise_for_status()
-        video_data = video_response.json()
+        video_items = await video_metadata.get_many([video_id], ("snippet",), PRIORITY_NORMAL)
         
-        if not video_data.get('items'):
+        if video_id not in video_items:
             raise ValueError("비디오를 찾을 수 없습니다.")
 
-        video_info = video_data['items'][0]
+        video_info = video_items[video_id]
         channel_id = video_info['snippet']['channelId']
 
-        channel_api = f"{YOUTUBE_API_URL}/channels?part=snippet,statistics&id={channel_id}&key={YOUTUBE_API_KEY}"
-        channel_response = requests.get(channel_api, timeout=10)
-        channel_response.raise_for_status()
-        channel_data = channel_response.json()
+        channel_data = await youtube_api_get("channels", f"part=snippet,statistics&id={channel_id}")
         
         if not channel_data.get('items'):
             raise ValueError("채널을 찾을 수 없습니다.")
 
         channel_info = channel_data['items'][0]
 
-        return {
-            'channelTitle': channel_info['snippet'].get('title', 'N/A'),
-            'channelUrl': f"https://www.youtube.com/channel/{channel_id}",
-            'subscriberCount': channel_info['statistics'].get('subscriberCount', '0'),
-            'viewCount': channel_info['statistics'].get('viewCount', '0'),
-            'videoCount': channel_info['statistics'].get('videoCount', '0'),
-            'videos': fetch_recent_videos(channel_id)
-        }
+        return build_channel_info(channel_id, channel_info, await fetch_recent_videos(channel_id))
     
-    except requests.exceptions.RequestException as e:
+    except QuotaExceededError as e:
+        raise RuntimeError(f"YouTube API 할당량 제한: {str(e)}")
+    except httpx.HTTPError as e:
         raise RuntimeError(f"YouTube API 요청 오류: {str(e)}")
     except Exception as e:
         raise RuntimeError(f"채널 정보 조회 중 오류 발생: {str(e)}")
 
+### Tool 3-2 : 여러 YouTube 동영상 URL의 채널 정보를 한 번에 가져옵니다
+@mcp.tool()
+async def get_channels_info(video_urls: list[str]) -> dict:
+    """여러 YouTube 동영상 URL의 채널 정보와 최근 5개의 동영상을 한 번에 가져옵니다 (같은 채널은 한 번만 조회)"""
+    try:
+        if not YOUTUBE_API_KEY:
+            raise ValueError("YouTube API 키가 설정되지 않았습니다.")
+
+        videos = []
+        video_ids = []
+        for url in video_urls:
+            try:
+                video_id = extract_video_id(url)
+            except ValueError as e:
+                videos.append({"url": url, "isError": True, "errorMessage": str(e)})
+                continue
+            videos.append({"url": url, "videoId": video_id})
+            video_ids.append(video_id)
+
+        # 1. 비디오 → 채널 ID (videos.list 를 50개씩 묶어서, 캐시된 영상은 생략)
+        video_items = await video_metadata.get_many(video_ids, ("snippet",), PRIORITY_NORMAL) if video_ids else {}
+
+        channel_ids = []
+        for video in videos:
+            if video.get("isError"):
+                continue
+            item = video_items.get(video["videoId"])
+            if item is None:
+                video.update({"isError": True, "errorMessage": "비디오를 찾을 수 없습니다."})
+                continue
+            video["channelId"] = item['snippet']['channelId']
+            if video["channelId"] not in channel_ids:
+                channel_ids.append(video["channelId"])
+
+        # 2. 중복 제거한 채널들을 channels.list 한 번 (50개 단위) 으로 조회하면서 RSS 피드도 동시에 가져오기
+        channel_items, *feeds = await asyncio.gather(
+            fetch_channel_items(channel_ids),
+            *[fetch_recent_videos(channel_id) for channel_id in channel_ids]
+        )
+
+        channels = {}
+        for channel_id, recent_videos in zip(channel_ids, feeds):
+            if channel_id in channel_items:
+                channels[channel_id] = build_channel_info(channel_id, channel_items[channel_id], recent_videos)
+            else:
+                channels[channel_id] = {"isError": True, "errorMessage": "채널을 찾을 수 없습니다."}
+
+        return {"videos": videos, "channels": channels}
+
+    except QuotaExceededError as e:
+        raise RuntimeError(f"YouTube API 할당량 제한: {str(e)}")
+    except httpx.HTTPError as e:
+        raise RuntimeError(f"YouTube API 요청 오류: {str(e)}")
+    except Exception as e:
+        raise RuntimeError(f"채널 정보 조회 중 오류 발생: {str(e)}")
+
+def collect_storage_stats() -> dict:
+    """SQLite 조회와 디렉터리 탐색이 필요한 통계 (이벤트 루프를 막지 않도록 스레드에서 호출)"""
+    stats = {"youtubeQuota": quota_scheduler.stats()}
+    sources = [
+        ("transcriptCache", transcript_cache),
+        ("transcriptIndex", transcript_index),
+        ("subtitleCache", subtitle_cache),
+    ]
+    if shared_store is not None:
+        sources.append(("sharedCache", shared_store))
+    for name, source in sources:
+        try:
+            stats[name] = source.stats()
+        except Exception as e:
+            stats[name] = {"error": str(e)}
+    return stats
+
+### Tool 4 : 서버 상태 (HTTP 커넥션 풀, 자막 추출 방법 통계, 요청 지표, 캐시, API 할당량) 를 조회합니다
+@mcp.tool()
+async def server_stats() -> dict:
+    """서버 상태 (HTTP 커넥션 풀 hit/miss, 자막 추출 방법별 성공률/지연 시간, 자막 추출 방법·Data API 엔드포인트·RSS 요청별 호출 수/오류 분류/지연 시간 분포/전송 바이트, 검색/자막 캐시, 남은 YouTube API 할당량) 를 조회합니다"""
+    stats = {
+        "worker": os.getpid(),
+        "httpPool": get_pool_stats(),
+        "transcriptMethods": method_ranker.stats(),
+        "metrics": metrics_registry.snapshot(),
+        "searchCache": search_cache.stats(),
+        "videoMetadata": video_metadata.stats(),
+        "channelFeeds": feed_cache.stats(),
+        "captionTracks": caption_track_cache.stats(),
+    }
+    stats.update(await asyncio.to_thread(collect_storage_stats))
+    return stats
+
+def create_http_app():
+    """streamable HTTP 모드 ASGI 앱 (uvicorn 워커 프로세스마다 호출, 엔드포인트: /mcp)
+    세션을 워커 메모리에 두지 않는 stateless 모드라 어느 워커가 요청을 받아도 처리할 수 있습니다."""
+    mcp.settings.stateless_http = True
+    mcp.settings.json_response = True
+    return mcp.streamable_http_app()
+
 if __name__ == "__main__":
-    print("Starting MCP server...")
-    mcp.run(transport="stdio")
\ No newline at end of file
+    # stdout 은 JSON-RPC 전용이므로 시작 로그는 stderr 로 (클라이언트가 import 완료 시점으로 사용)
+    print(f"Starting MCP server... (imports {time.perf_counter() - IMPORT_STARTED:.3f}s)", file=sys.stderr, flush=True)
+    if METRICS_PORT:
+        if MCP_TRANSPORT == "streamable-http" and MCP_HTTP_WORKERS > 1:
+            # 지표는 프로세스별 메모리에 있으므로 워커 여러 개일 때는 워커마다 포트가 필요해 지원하지 않음
+            print("METRICS_PORT 는 워커가 1개일 때만 사용할 수 있습니다 (server_stats 도구 사용)", file=sys.stderr, flush=True)
+        else:
+            start_prometheus_server(METRICS_PORT, METRICS_HOST)
+            print(f"Prometheus 지표: http://{METRICS_HOST}:{METRICS_PORT}/metrics", file=sys.stderr, flush=True)
+    if MCP_TRANSPORT == "stdio":
+        mcp.run(transport="stdio")
+    elif MCP_TRANSPORT == "streamable-http":
+        import uvicorn
+
+        if MCP_HTTP_WORKERS > 1:
+            # 워커마다 이 모듈을 새로 import 하므로 앱은 팩토리 함수로 전달
+            uvicorn.run(
+                "mcp_server:create_http_app", factory=True,
+                host=MCP_HTTP_HOST, port=MCP_HTTP_PORT, workers=MCP_HTTP_WORKERS,
+                app_dir=os.path.dirname(os.path.abspath(__file__))
+            )
+        else:
+            uvicorn.run(create_http_app(), host=MCP_HTTP_HOST, port=MCP_HTTP_PORT)
+    else:
+        raise SystemExit(f"지원하지 않는 MCP_TRANSPORT: {MCP_TRANSPORT} (stdio 또는 streamable-http)")
\ No newline at end of file
@@ -0,0 +1,178 @@
+import asyncio
+import atexit
+import contextlib
+import threading
+import time
+
+from mcp_stdio_client import SimpleMCPClient, MCPError
+
+
+class _Slot:
+    """풀 안의 서버 프로세스 하나"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.client = None
+        self.connecting = None  # concurrent.futures.Future (연결 중일 때)
+        self.active = 0  # 현재 이 서버를 사용 중인 호출 수
+        self.restarts = 0
+        self.last_error = None
+
+
+class MCPServerPool:
+    """여러 Streamlit 세션이 공유하는 MCP 서버 프로세스 풀
+
+    size 개의 서버 프로세스를 미리 띄워 두고, 호출할 때마다 사용 중인 호출이 가장 적은 서버를
+    빌려 줍니다 (SimpleMCPClient 가 요청을 id 로 구분하므로 한 서버를 여러 세션이 동시에 사용 가능).
+    백그라운드 스레드가 health_interval 초마다 ping 으로 상태를 확인하고, 종료되었거나 응답하지
+    않는 서버는 새로 띄웁니다.
+    """
+
+    def __init__(self, command, args, size: int = 2, health_interval: float = 30.0,
+                 ping_timeout: float = 5.0, on_error=print):
+        self.command = command
+        self.args = args
+        self.size = max(1, size)
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+        self.on_error = on_error
+        self._slots = [_Slot(i) for i in range(self.size)]
+        # 재진입 가능 잠금: 연결 future 가 이미 끝나 있으면 add_done_callback 이 잠금을 쥔 스레드에서
+        # 바로 콜백을 실행하므로 (예: 프로세스 실행 즉시 실패) 일반 Lock 이면 교착 상태가 됨
+        self._lock = threading.RLock()
+        self._closed = False
+        self._health_thread = None
+        atexit.register(self.close)
+
+    def _start_connect(self, slot: _Slot):
+        """(잠금 안에서 호출) 슬롯의 서버를 새로 띄우고 연결 시작"""
+        if slot.client is not None:
+            old = slot.client
+            threading.Thread(target=old.disconnect, daemon=True).start()
+            slot.restarts += 1
+        client = SimpleMCPClient(self.command, self.args, on_error=self.on_error)
+        slot.client = client
+        slot.connecting = asyncio.run_coroutine_threadsafe(client._connect(), client._ensure_loop())
+
+        def done(future, slot=slot, client=client):
+            with self._lock:
+                if slot.client is not client:
+                    return
+                slot.connecting = None
+                error = None if future.cancelled() else future.exception()
+                if error is not None or not future.result():
+                    slot.last_error = str(error or "initialize 실패")
+
+        slot.connecting.add_done_callback(done)
+
+    def _healthy(self, slot: _Slot) -> bool:
+        return slot.client is not None and slot.connecting is None and slot.client.connected and slot.last_error is None
+
+    def start(self):
+        """모든 서버를 띄우고 상태 확인 스레드 시작 (이미 시작했으면 아무것도 하지 않음)"""
+        with self._lock:
+            if self._closed:
+                raise MCPError("MCP 서버 풀이 종료되었습니다.")
+            for slot in self._slots:
+                if slot.client is None:
+                    self._start_connect(slot)
+            if self._health_thread is None:
+                self._health_thread = threading.Thread(target=self._health_loop, name="mcp-pool-health", daemon=True)
+                self._health_thread.start()
+
+    def _pick(self) -> _Slot:
+        """사용 중인 호출이 가장 적은 서버 선택 (죽은 서버는 다시 띄움)"""
+        with self._lock:
+            for slot in self._slots:
+                if slot.connecting is None and not self._healthy(slot):
+                    slot.last_error = None
+                    self._start_connect(slot)
+            ready = [slot for slot in self._slots if self._healthy(slot)]
+            slot = min(ready or self._slots, key=lambda s: (s.active, s.connecting is not None))
+            slot.active += 1
+            return slot
+
+    @contextlib.asynccontextmanager
+    async def lease(self):
+        """서버 하나를 빌려 SimpleMCPClient 를 돌려줌 (연결 중이면 연결될 때까지 대기)"""
+        self.start()
+        slot = self._pick()
+        try:
+            connecting = slot.connecting
+            if connecting is not None:
+                connected = await asyncio.wrap_future(connecting)
+                if not connected:
+                    raise MCPError("MCP 서버 초기화에 실패했습니다.")
+            elif slot.last_error is not None:
+                # 연결이 바로 실패한 서버 (다음 호출에서 다시 띄움)
+                raise MCPError(f"MCP 서버 연결 실패: {slot.last_error}")
+            yield slot.client
+        finally:
+            with self._lock:
+                slot.active -= 1
+
+    async def call_tool(self, tool_name, arguments, timeout: float = None):
+        """풀의 서버 하나로 도구 호출 (SimpleMCPClient.call_tool 과 같은 반환값)"""
+        try:
+            async with self.lease() as client:
+                return await client.call_tool(tool_name, arguments, timeout)
+        except Exception as e:
+            self.on_error(f"도구 호출 오류: {str(e)}")
+            return None
+
+    @property
+    def tools(self) -> list:
+        for slot in self._slots:
+            if slot.client is not None and slot.client.tools:
+                return slot.client.tools
+        return []
+
+    def _ping(self, client: SimpleMCPClient) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                client._request("ping", None, self.ping_timeout), client._ensure_loop()
+            )
+            future.result(self.ping_timeout + 1)
+            return True
+        except Exception:
+            return False
+
+    def _health_loop(self):
+        """주기적으로 각 서버에 ping - 종료되었거나 응답이 없으면 다시 띄움"""
+        while not self._closed:
+            time.sleep(self.health_interval)
+            for slot in self._slots:
+                with self._lock:
+                    if self._closed or slot.connecting is not None or slot.client is None:
+                        continue
+                    client = slot.client
+                alive = client.connected and self._ping(client)
+                if not alive:
+                    with self._lock:
+                        if slot.client is client and not self._closed:
+                            print(f"MCP 서버 #{slot.index} 응답 없음 - 다시 시작합니다.")
+                            slot.last_error = None
+                            self._start_connect(slot)
+
+    def stats(self) -> list:
+        with self._lock:
+            return [{
+                "index": slot.index,
+                "pid": slot.client.process.pid if slot.client and slot.client.process else None,
+                "healthy": self._healthy(slot),
+                "connecting": slot.connecting is not None,
+                "active": slot.active,
+                "restarts": slot.restarts,
+                "startup": slot.client.startup_metrics if slot.client else {},
+                "lastError": slot.last_error,
+            } for slot in self._slots]
+
+    def close(self):
+        """모든 서버 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            clients = [slot.client for slot in self._slots if slot.client is not None]
+        for client in clients:
+            client.disconnect()
@@ -0,0 +1,303 @@
+import asyncio
+import collections
+import itertools
+import json
+import threading
+import time
+
+# 서버 응답 한 줄의 최대 크기 (긴 자막 응답도 한 줄로 옴)
+STREAM_LIMIT = 64 * 1024 * 1024
+
+# mcp_server.py 가 import 를 마치고 stderr 에 쓰는 시작 로그
+SERVER_READY_MARKER = "Starting MCP server"
+
+
+class MCPError(Exception):
+    """MCP 서버가 JSON-RPC 오류로 응답했거나 연결이 끊어짐"""
+    pass
+
+
+class SimpleMCPClient:
+    """stdio 로 MCP 서버 프로세스와 통신하는 간단한 클라이언트
+
+    서버 프로세스와 파이프는 클라이언트 전용 이벤트 루프(백그라운드 스레드)의 asyncio 스트림으로
+    다룹니다. Streamlit 은 실행마다 새 이벤트 루프를 쓰므로, 호출하는 쪽 루프는 결과만 기다리고
+    실제 읽기/쓰기는 전용 루프에서 이루어져 호출하는 쪽 루프를 막지 않습니다.
+
+    요청마다 고유한 JSON-RPC id 를 붙이고, 읽기 태스크가 응답을 id 별로 기다리는 쪽(Future)에
+    전달합니다. 그래서 하나의 서버 파이프로 여러 call_tool 을 동시에 보낼 수 있고, 알림이나
+    로그 줄이 섞여도 응답이 꼬이지 않습니다. stderr 는 계속 읽어 버퍼가 차서 서버가 멈추지 않게 합니다.
+    """
+
+    def __init__(self, command, args, on_error=print, timeout: float = 120.0, connect_timeout: float = 30.0):
+        self.command = command
+        self.args = args
+        self.on_error = on_error
+        self.timeout = timeout  # 요청별 기본 제한 시간 (초, None 이면 무제한)
+        self.connect_timeout = connect_timeout  # 서버 시작부터 initialize 응답까지의 제한 시간
+        # 시작 지연 시간 (초): spawn = 프로세스 생성, import = 생성 후 서버 시작 로그까지 (인터프리터 + 모듈 import),
+        # handshake = 그 이후 initialize 응답까지, toolsList = tools/list 응답까지, total = 전체
+        self.startup_metrics = {}
+        self._spawned_at = None
+        self._ready_at = None
+        self.process = None
+        self.tools = []
+        self.notifications = collections.deque(maxlen=50)  # 최근 서버 알림 (로그 메시지 등)
+        self.stderr_tail = collections.deque(maxlen=200)  # 최근 stderr 줄 (진단용)
+        self._ids = itertools.count(1)
+        self._pending = {}  # request id -> Future (전용 루프 소속)
+        self._loop = None
+        self._thread = None
+        self._tasks = []
+
+    def _ensure_loop(self):
+        """전용 이벤트 루프 스레드 시작"""
+        if self._loop is None:
+            ready = threading.Event()
+
+            def run():
+                self._loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+                ready.set()
+                self._loop.run_forever()
+                self._loop.close()
+
+            self._thread = threading.Thread(target=run, name="mcp-client-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+        return self._loop
+
+    async def _run(self, coro):
+        """코루틴을 전용 루프에서 실행하고 결과를 기다림 (기다리던 쪽이 취소되면 전용 루프 쪽도 취소)"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    @property
+    def connected(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def connect(self):
+        """MCP 서버에 연결"""
+        try:
+            return await self._run(self._connect())
+        except Exception as e:
+            self.on_error(f"MCP 서버 연결 오류: {str(e)}")
+            return False
+
+    async def _connect(self):
+        started = time.perf_counter()
+        # MCP 서버 프로세스 시작
+        self.process = await asyncio.create_subprocess_exec(
+            self.command, *self.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT
+        )
+        self._spawned_at = time.perf_counter()
+        self._ready_at = None
+        self._tasks = [
+            asyncio.create_task(self._read_loop()),
+            asyncio.create_task(self._drain_stderr()),
+        ]
+
+        # 1. 초기화 요청 - 고정 대기 없이 바로 보냄 (서버는 import 가 끝나면 stdin 을 읽고 응답)
+        #    응답이 오면 준비된 것이고, 서버가 먼저 종료되면 기다리지 않고 바로 실패
+        init_response = await self._request("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {
+                "tools": {}
+            },
+            "clientInfo": {
+                "name": "streamlit-client",
+                "version": "1.0.0"
+            }
+        }, self.connect_timeout)
+        initialized_at = time.perf_counter()
+
+        if not init_response:
+            return False
+
+        # 2. 초기화 완료 알림
+        await self._send_message({
+            "jsonrpc": "2.0",
+            "method": "notifications/initialized"
+        })
+
+        # 3. 도구 목록 요청
+        tools_response = await self._request("tools/list", None, self.timeout)
+        finished = time.perf_counter()
+        ready_at = self._ready_at or initialized_at
+        self.startup_metrics = {
+            "spawn": round(self._spawned_at - started, 4),
+            "import": round(ready_at - self._spawned_at, 4),
+            "handshake": round(initialized_at - ready_at, 4),
+            "toolsList": round(finished - initialized_at, 4),
+            "total": round(finished - started, 4),
+        }
+
+        if tools_response and "tools" in tools_response:
+            self.tools = tools_response["tools"]
+            return True
+
+        return False
+
+    async def _send_message(self, message):
+        """메시지 전송 (한 번의 write 로 한 줄을 쓰므로 동시 요청끼리 섞이지 않음)"""
+        if not self.connected or self.process.stdin is None:
+            raise MCPError("MCP 서버가 실행 중이 아닙니다.")
+        self.process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+
+    async def _read_loop(self):
+        """서버 stdout 을 한 줄씩 읽어 응답은 id 별 Future 로, 알림은 notifications 로 전달"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                line = line.decode("utf-8", errors="ignore").strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    # JSON-RPC 가 아닌 출력 (print 로그 등)
+                    print(f"MCP 서버 출력: {line}")
+                    continue
+                if isinstance(message, dict):
+                    await self._dispatch(message)
+        except (OSError, ValueError) as e:
+            print(f"MCP 서버 출력 읽기 오류: {e}")
+        finally:
+            self._fail_pending(MCPError("MCP 서버 연결이 종료되었습니다."))
+
+    async def _drain_stderr(self):
+        """stderr 를 계속 읽어 파이프 버퍼가 차지 않게 함 (최근 줄만 보관)"""
+        try:
+            while True:
+                line = await self.process.stderr.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", errors="ignore").rstrip()
+                if self._ready_at is None and SERVER_READY_MARKER in text:
+                    self._ready_at = time.perf_counter()
+                self.stderr_tail.append(text)
+        except (OSError, ValueError):
+            pass
+
+    async def _dispatch(self, message: dict):
+        if "method" in message:
+            if "id" in message:
+                # 서버가 보낸 요청 (ping 만 응답, 나머지는 지원하지 않음)
+                await self._reply_to_server(message)
+            else:
+                self.notifications.append(message)
+            return
+
+        future = self._pending.pop(message.get("id"), None)
+        if future is None or future.done():
+            return  # 취소되었거나 알 수 없는 응답
+        if "error" in message:
+            error = message["error"] or {}
+            future.set_exception(MCPError(error.get("message", "알 수 없는 오류")))
+        else:
+            future.set_result(message.get("result"))
+
+    async def _reply_to_server(self, message: dict):
+        if message["method"] == "ping":
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            reply = {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32601, "message": "Method not found"}}
+        try:
+            await self._send_message(reply)
+        except (OSError, MCPError):
+            pass
+
+    def _fail_pending(self, error: Exception):
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _request(self, method: str, params, timeout):
+        """전용 루프에서 실행 - 요청 전송 후 같은 id 의 응답을 기다림"""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            await self._send_message(message)
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # 서버에도 취소를 알려 더 이상 처리하지 않도록 함
+            if self._pending.pop(request_id, None) is not None:
+                try:
+                    await self._send_message({
+                        "jsonrpc": "2.0",
+                        "method": "notifications/cancelled",
+                        "params": {"requestId": request_id, "reason": "client timeout or cancel"}
+                    })
+                except (OSError, MCPError):
+                    pass
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def request(self, method: str, params: dict = None, timeout: float = None):
+        """JSON-RPC 요청을 보내고 응답 결과 반환 (오류 응답은 MCPError, 제한 시간 초과는 TimeoutError)"""
+        return await self._run(self._request(method, params, timeout if timeout is not None else self.timeout))
+
+    async def call_tool(self, tool_name, arguments, timeout: float = None):
+        """도구 호출"""
+        try:
+            response = await self.request("tools/call", {
+                "name": tool_name,
+                "arguments": arguments
+            }, timeout)
+
+            if response:
+                return response
+            else:
+                return None
+
+        except asyncio.TimeoutError:
+            self.on_error(f"도구 호출 시간 초과: {tool_name}")
+            return None
+        except Exception as e:
+            self.on_error(f"도구 호출 오류: {str(e)}")
+            return None
+
+    async def _close(self):
+        for task in self._tasks:
+            task.cancel()
+        if self.process and self.process.returncode is None:
+            if self.process.stdin:
+                self.process.stdin.close()
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        self._fail_pending(MCPError("MCP 서버 연결이 종료되었습니다."))
+
+    def disconnect(self):
+        """연결 종료 (서버 프로세스와 전용 루프 정리)"""
+        if self._loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self._loop).result(10)
+        except Exception as e:
+            print(f"MCP 서버 종료 오류: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+        self._thread = None
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import deque
+
+
+class MethodRanker:
+    """자막 추출 방법별 성공률/지연 시간 통계로 시도 순서를 정하는 클래스
+
+    각 방법의 최근 window 회 결과로 성공 확률 p 와 평균 소요 시간 t 를 구하고,
+    기대 소요 시간(순차 시도 기준)이 최소가 되도록 t / p 가 작은 순서로 정렬합니다.
+    probe_interval 초 동안 한 번도 시도되지 않은 방법은 다음 요청에서 맨 앞에 두어
+    (하위로 밀려난 방법도) 통계가 다시 갱신될 수 있게 합니다.
+    """
+
+    def __init__(self, window: int = 50, probe_interval: float = 300.0, default_latency: float = 5.0):
+        self.window = window
+        self.probe_interval = probe_interval
+        self.default_latency = default_latency
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._last_attempt = {}
+
+    def record(self, name: str, success: bool, latency: float):
+        """방법 실행 결과 기록"""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self._samples[name] = samples
+            samples.append((success, latency))
+            self._last_attempt[name] = time.monotonic()
+
+    def _estimate(self, name: str) -> tuple:
+        """(성공 확률, 평균 소요 시간) 추정 - 표본이 적을 때를 위해 라플라스 보정"""
+        samples = self._samples.get(name)
+        if not samples:
+            return 0.5, self.default_latency
+        successes = sum(1 for success, _ in samples if success)
+        probability = (successes + 1) / (len(samples) + 2)
+        latency = sum(latency for _, latency in samples) / len(samples)
+        return probability, latency
+
+    def order(self, methods: list) -> list:
+        """기대 소요 시간이 최소가 되는 순서로 정렬한 방법 목록 (통계가 없으면 기존 순서 유지)"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._samples:
+                return list(methods)
+
+            ranked = sorted(methods, key=lambda method: self._score(method.__name__))
+
+            # 오랫동안 시도되지 않은 방법 하나를 맨 앞으로 (복구 여부 확인)
+            stale = [
+                method for method in ranked[1:]
+                if now - self._last_attempt.get(method.__name__, float("-inf")) > self.probe_interval
+            ]
+            if stale:
+                probe = stale[0]
+                # 같은 방법을 여러 요청이 동시에 탐색하지 않도록 시도 시각을 미리 갱신
+                self._last_attempt[probe.__name__] = now
+                ranked.remove(probe)
+                ranked.insert(0, probe)
+
+        return ranked
+
+    def _score(self, name: str) -> float:
+        probability, latency = self._estimate(name)
+        return latency / probability
+
+    def stats(self) -> dict:
+        """방법별 시도 횟수, 성공률, 평균 소요 시간"""
+        with self._lock:
+            result = {}
+            for name, samples in self._samples.items():
+                probability, latency = self._estimate(name)
+                result[name] = {
+                    "attempts": len(samples),
+                    "successRate": round(sum(1 for success, _ in samples if success) / len(samples), 3),
+                    "avgLatency": round(latency, 3),
+                    "score": round(latency / probability, 3),
+                }
+        return result
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import contextvars
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 지연 시간 히스토그램 구간 상한 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 지금 실행 중인 측정 대상 (http_client 가 받은 응답 바이트를 여기에 더함)
+_current = contextvars.ContextVar("metrics_current_operation", default=None)
+
+
+class OperationMetrics:
+    """측정 대상 하나 (예: 자막 추출 방법 하나, API 엔드포인트 하나) 의 누적 값"""
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = {}  # 오류 분류 -> 횟수
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # 마지막 칸은 +Inf
+        self.latency_sum = 0.0
+        self.observed = 0
+        self.bytes = 0
+
+    def observe(self, seconds: float):
+        index = 0
+        while index < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.latency_sum += seconds
+        self.observed += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": dict(self.failures),
+            "latency": {
+                "count": self.observed,
+                "avgMs": round(self.latency_sum / self.observed * 1000, 1) if self.observed else None,
+                "buckets": {
+                    ("+Inf" if index == len(LATENCY_BUCKETS) else str(LATENCY_BUCKETS[index])): count
+                    for index, count in enumerate(self.buckets)
+                },
+            },
+            "bytes": self.bytes,
+        }
+
+
+class Observation:
+    """measure() 안에서 결과를 실패로 표시하거나 전송 바이트를 더할 때 사용"""
+
+    def __init__(self, operation: OperationMetrics):
+        self.operation = operation
+        self.error = None
+        self.observe = True
+        self.started = time.perf_counter()
+
+    def fail(self, error_class: str, observe: bool = True):
+        """실패로 기록 (observe=False 면 지연 시간 히스토그램에서 제외 - 요청을 보내기 전에 거절된 경우 등)"""
+        self.error = error_class or "unknown"
+        self.observe = observe
+
+    def restart(self):
+        """지연 시간 측정 시작 시각을 지금으로 (요청 전 대기 시간 제외)"""
+        self.started = time.perf_counter()
+
+
+class MetricsRegistry:
+    """자막 추출 방법 / Data API 엔드포인트 / RSS 요청 별 호출 수, 오류 분류, 지연 시간, 전송 바이트"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}  # (kind, name) -> OperationMetrics
+
+    def _operation(self, kind: str, name: str) -> OperationMetrics:
+        key = (kind, name)
+        operation = self._operations.get(key)
+        if operation is None:
+            with self._lock:
+                operation = self._operations.setdefault(key, OperationMetrics())
+        return operation
+
+    @contextlib.contextmanager
+    def measure(self, kind: str, name: str):
+        """with 블록 실행 시간을 기록 (예외가 나면 예외 클래스 이름으로 실패 기록)
+        취소된 경우 (헤지 실행에서 진 방법 등) 는 "cancelled" 로 세고 지연 시간에는 넣지 않음"""
+        operation = self._operation(kind, name)
+        observation = Observation(operation)
+        token = _current.set(observation)
+        try:
+            yield observation
+        except asyncio.CancelledError:
+            observation.fail("cancelled", observe=False)
+            raise
+        except BaseException as e:
+            if observation.error is None:
+                observation.fail(type(e).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - observation.started
+            _current.reset(token)
+            with self._lock:
+                operation.calls += 1
+                if observation.error is None:
+                    operation.successes += 1
+                else:
+                    operation.failures[observation.error] = operation.failures.get(observation.error, 0) + 1
+                if observation.observe:
+                    operation.observe(elapsed)
+
+    def snapshot(self) -> dict:
+        """{kind: {name: {...}}}"""
+        result = {}
+        with self._lock:
+            for (kind, name), operation in sorted(self._operations.items()):
+                result.setdefault(kind, {})[name] = operation.snapshot()
+        return result
+
+    def prometheus_text(self, prefix: str = "youtube_agent") -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        def labels(**values) -> str:
+            escaped = (
+                f'{key}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                for key, value in values.items()
+            )
+            return "{" + ",".join(escaped) + "}"
+
+        calls, failures, histogram, transferred = [], [], [], []
+        with self._lock:
+            for (kind, name), operation in sorted(self._operations.items()):
+                calls.append(f"{prefix}_calls_total{labels(kind=kind, name=name)} {operation.calls}")
+                for error, count in sorted(operation.failures.items()):
+                    failures.append(f"{prefix}_failures_total{labels(kind=kind, name=name, error=error)} {count}")
+                cumulative = 0
+                for index, count in enumerate(operation.buckets):
+                    cumulative += count
+                    bound = "+Inf" if index == len(LATENCY_BUCKETS) else str(LATENCY_BUCKETS[index])
+                    histogram.append(f"{prefix}_latency_seconds_bucket{labels(kind=kind, name=name, le=bound)} {cumulative}")
+                histogram.append(f"{prefix}_latency_seconds_sum{labels(kind=kind, name=name)} {operation.latency_sum:.6f}")
+                histogram.append(f"{prefix}_latency_seconds_count{labels(kind=kind, name=name)} {operation.observed}")
+                transferred.append(f"{prefix}_bytes_total{labels(kind=kind, name=name)} {operation.bytes}")
+
+        lines = [
+            f"# HELP {prefix}_calls_total Calls per transcript method, Data API endpoint and RSS fetch.",
+            f"# TYPE {prefix}_calls_total counter", *calls,
+            f"# HELP {prefix}_failures_total Failed calls by error class.",
+            f"# TYPE {prefix}_failures_total counter", *failures,
+            f"# HELP {prefix}_latency_seconds Call latency.",
+            f"# TYPE {prefix}_latency_seconds histogram", *histogram,
+            f"# HELP {prefix}_bytes_total Response bytes received.",
+            f"# TYPE {prefix}_bytes_total counter", *transferred,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def add_transfer_bytes(count: int):
+    """현재 측정 중인 대상에 받은 바이트 수를 더함 (측정 중이 아니면 무시)"""
+    observation = _current.get()
+    if observation is not None and count:
+        with registry._lock:
+            observation.operation.bytes += count
+
+
+registry = MetricsRegistry()
+
+
+def start_prometheus_server(port: int, host: str = "0.0.0.0"):
+    """/metrics 에서 Prometheus 텍스트를 제공하는 백그라운드 HTTP 서버"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = registry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
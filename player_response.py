@@ -0,0 +1,118 @@
+import json
+import time
+from collections import OrderedDict
+
+PLAYER_RESPONSE_MARKER = "ytInitialPlayerResponse"
+
+_decoder = json.JSONDecoder()
+
+
+def find_player_response(page: str):
+    """시청 페이지 HTML 에서 ytInitialPlayerResponse 객체를 찾아 디코딩 (없으면 None)
+
+    표시 문자열을 str.find 로 찾은 뒤 '=' 다음의 JSON 객체 하나만 raw_decode 로 읽으므로
+    페이지 전체를 정규식으로 여러 번 훑지 않고, 문자열 안의 \\u0026 같은 이스케이프도 그대로 복원됩니다.
+    (var ytInitialPlayerResponse = {...}; / window["ytInitialPlayerResponse"] = {...}; 모두 처리)
+    """
+    position = page.find(PLAYER_RESPONSE_MARKER)
+    while position != -1:
+        index = position + len(PLAYER_RESPONSE_MARKER)
+        # 닫는 따옴표/대괄호와 공백 건너뛰기
+        while index < len(page) and page[index] in "\"'] \t\r\n":
+            index += 1
+        if index < len(page) and page[index] == "=":
+            index += 1
+            while index < len(page) and page[index] in " \t\r\n":
+                index += 1
+            if index < len(page) and page[index] == "{":
+                try:
+                    value, _ = _decoder.raw_decode(page, index)
+                except ValueError:
+                    value = None
+                if isinstance(value, dict):
+                    return value
+        # 다른 곳에서 이름만 언급된 경우 (예: 변수 선언, null 대입) 다음 위치 검색
+        position = page.find(PLAYER_RESPONSE_MARKER, index)
+    return None
+
+
+def caption_tracks(player_response: dict) -> list:
+    """플레이어 응답의 자막 트랙 목록 [{"baseUrl", "languageCode", "kind", "name"}]
+    kind 는 자동 생성 자막이면 "asr", 직접 올린 자막이면 ""."""
+    renderer = (player_response.get("captions") or {}).get("playerCaptionsTracklistRenderer") or {}
+    tracks = []
+    for track in renderer.get("captionTracks") or []:
+        if not track.get("baseUrl"):
+            continue
+        name = track.get("name") or {}
+        if "simpleText" in name:
+            name = name["simpleText"]
+        else:
+            name = "".join(run.get("text", "") for run in name.get("runs") or [])
+        tracks.append({
+            "baseUrl": track["baseUrl"],
+            "languageCode": track.get("languageCode", ""),
+            "kind": track.get("kind", ""),
+            "name": name,
+        })
+    return tracks
+
+
+def is_playable(player_response: dict) -> bool:
+    """비공개/삭제/로그인 필요 영상이 아닌지"""
+    status = (player_response.get("playabilityStatus") or {}).get("status", "OK")
+    return status in ("OK", "LIVE_STREAM_OFFLINE")
+
+
+def rank_caption_tracks(tracks: list, languages: tuple = ("ko", "en")) -> list:
+    """선호 순서대로 정렬한 트랙 목록
+    요청 언어 순서 (같은 언어에서는 직접 올린 자막 → 자동 생성 자막), 그다음 나머지 트랙 (직접 올린 자막 우선)"""
+    def language_rank(track: dict) -> int:
+        code = track["languageCode"]
+        for rank, lang in enumerate(languages):
+            # "en" 요청에 "en-US" 트랙도 해당
+            if code == lang or code.split("-")[0] == lang:
+                return rank
+        return len(languages)
+
+    return sorted(tracks, key=lambda track: (language_rank(track), track["kind"] == "asr"))
+
+
+class CaptionTrackCache:
+    """비디오별 자막 트랙 목록 캐시 (트랙을 받지 못해 다시 시도하거나 자막 캐시에서 밀려난 영상을 다시 조회할 때
+    시청 페이지를 다시 받지 않도록). 트랙 URL 에 만료 서명이 있으므로 ttl 이 지나면 다시 가져옵니다."""
+
+    def __init__(self, ttl: float = 3600, maxsize: int = 2000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # video_id -> (저장 시각, 재생 가능 여부, 트랙 목록)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, video_id: str):
+        """(재생 가능 여부, 트랙 목록) 또는 None"""
+        entry = self._entries.get(video_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            if entry is not None:
+                del self._entries[video_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(video_id)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, video_id: str, playable: bool, tracks: list):
+        self._entries[video_id] = (time.monotonic(), playable, tracks)
+        self._entries.move_to_end(video_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, video_id: str):
+        self._entries.pop(video_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
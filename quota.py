@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")  # YouTube Data API 할당량은 태평양 시간 자정에 초기화
+except Exception:
+    QUOTA_TIMEZONE = timezone.utc
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# YouTube Data API 엔드포인트별 할당량 비용 (단위)
+ENDPOINT_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+}
+
+
+class QuotaExceededError(Exception):
+    """일일 할당량 또는 요청 속도 제한으로 요청을 보낼 수 없음"""
+    pass
+
+
+class QuotaScheduler:
+    """YouTube Data API 할당량 스케줄러
+
+    - 일일 예산(단위): 엔드포인트 비용만큼 차감, 우선순위가 낮은 요청은 예비분을 남기고 거절
+    - 초당 요청 수: 토큰 버킷, 토큰이 없으면 우선순위 순서로 대기 (max_wait 초과 시 거절)
+    ledger(SharedStore) 를 주면 일일 사용량을 여러 프로세스가 함께 기록합니다 (HTTP 워커 모드).
+    """
+
+    def __init__(self, daily_budget: int = 10000, rate: float = 5.0, burst: int = 10,
+                 max_wait: float = 10.0, normal_reserve: float = 0.0, low_reserve: float = 0.3,
+                 ledger=None):
+        self.daily_budget = daily_budget
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        # 전체 예산 중 상위 우선순위를 위해 남겨둘 비율
+        # (도구 호출은 NORMAL, 백그라운드 갱신은 LOW 이므로 기본값은 LOW 만 예비분을 남김)
+        self.reserves = {
+            PRIORITY_HIGH: 0.0,
+            PRIORITY_NORMAL: normal_reserve,
+            PRIORITY_LOW: low_reserve,
+        }
+        self.ledger = ledger
+        self._lock = threading.Lock()
+        self._day = self._current_day()
+        self._used = 0
+        self._exhausted = False
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._dispatcher = None
+        self.rejected = 0
+
+    @staticmethod
+    def _current_day() -> str:
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+    def _roll_day(self):
+        day = self._current_day()
+        if day != self._day:
+            self._day = day
+            self._used = 0
+            self._exhausted = False
+
+    def _reserve_units(self, endpoint: str, priority: int) -> int:
+        """일일 예산에서 비용만큼 미리 차감 (부족하면 QuotaExceededError)"""
+        cost = ENDPOINT_COSTS.get(endpoint, 1)
+        with self._lock:
+            self._roll_day()
+            reserve = self.daily_budget * self.reserves.get(priority, 0.0)
+            if self.ledger is not None:
+                # 다른 프로세스의 사용량까지 포함해 원자적으로 차감
+                ok, used = self.ledger.reserve_quota(self._day, cost, self.daily_budget - reserve)
+                if not ok:
+                    self.rejected += 1
+                    raise QuotaExceededError(
+                        f"YouTube API 일일 할당량 부족 ({endpoint} 비용 {cost}, 남은 할당량 {max(self.daily_budget - used, 0)})"
+                    )
+                self._used = used + cost
+                return cost
+            remaining = self.daily_budget - self._used
+            if self._exhausted or remaining - cost < reserve:
+                self.rejected += 1
+                raise QuotaExceededError(
+                    f"YouTube API 일일 할당량 부족 ({endpoint} 비용 {cost}, 남은 할당량 {max(remaining, 0)})"
+                )
+            self._used += cost
+        return cost
+
+    def _refund_units(self, cost: int):
+        with self._lock:
+            self._used = max(self._used - cost, 0)
+            if self.ledger is not None:
+                self.ledger.refund_quota(self._day, cost)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def _dispatch(self):
+        """토큰이 생길 때마다 우선순위가 가장 높은 대기 요청을 깨움"""
+        while self._waiters:
+            self._refill()
+            if self._tokens >= 1:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    self._tokens -= 1
+                    future.set_result(None)
+                continue
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+        self._dispatcher = None
+
+    async def _take_token(self, priority: int):
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise QuotaExceededError(f"YouTube API 요청 대기 시간 초과 ({self.max_wait}초)")
+
+    async def acquire(self, endpoint: str, priority: int = PRIORITY_NORMAL):
+        """요청 전에 호출 - 할당량을 차감하고 속도 제한에 맞춰 대기
+        공유 장부(ledger) 는 SQLite 잠금을 기다릴 수 있으므로 이벤트 루프 밖 스레드에서 기록합니다."""
+        if self.ledger is not None:
+            cost = await asyncio.to_thread(self._reserve_units, endpoint, priority)
+        else:
+            cost = self._reserve_units(endpoint, priority)
+        try:
+            await self._take_token(priority)
+        except BaseException:
+            # 요청을 보내지 못했으므로 할당량 반환 (취소된 경우에도 반환되도록 기다리지 않고 스레드에 맡김)
+            if self.ledger is not None:
+                asyncio.get_running_loop().run_in_executor(None, self._refund_units, cost)
+            else:
+                self._refund_units(cost)
+            raise
+
+    def mark_exhausted(self):
+        """API 가 quotaExceeded 를 응답하면 오늘은 더 이상 요청하지 않음
+        (ledger 가 있으면 SQLite 에 기록하므로 이벤트 루프에서는 asyncio.to_thread 로 호출)"""
+        with self._lock:
+            self._roll_day()
+            self._exhausted = True
+            self._used = max(self._used, self.daily_budget)
+            if self.ledger is not None:
+                self.ledger.mark_quota_exhausted(self._day, self.daily_budget)
+
+    def stats(self) -> dict:
+        """ledger 가 있으면 SQLite 를 읽으므로 이벤트 루프에서는 asyncio.to_thread 로 호출
+        (다른 워커가 쓰기 잠금을 잡고 있으면 busy timeout 까지 기다릴 수 있음)"""
+        with self._lock:
+            self._roll_day()
+            day = self._day
+        if self.ledger is not None:
+            # 장부 조회 중에 _lock 을 잡고 있으면 다른 스레드의 할당량 차감까지 함께 멈추므로 잠금 밖에서 조회
+            usage = self.ledger.quota_usage(day)
+        with self._lock:
+            if self.ledger is not None and day == self._day:
+                self._used, self._exhausted = usage
+            used = self._used
+            exhausted = self._exhausted
+        # 우선순위별로 실제로 쓸 수 있는 단위 (예비분 제외)
+        available = {
+            name: 0 if exhausted else max(int(self.daily_budget * (1 - self.reserves[priority])) - used, 0)
+            for name, priority in (("high", PRIORITY_HIGH), ("normal", PRIORITY_NORMAL), ("low", PRIORITY_LOW))
+        }
+        return {
+            "day": day,
+            "dailyBudget": self.daily_budget,
+            "used": used,
+            "remaining": max(self.daily_budget - used, 0),
+            "available": available,
+            "exhausted": exhausted,
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "rejected": self.rejected,
+            "rate": self.rate,
+        }
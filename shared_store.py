@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SharedStore:
+    """여러 서버 프로세스(HTTP 워커)가 함께 쓰는 SQLite 저장소
+
+    - 키-값 캐시: namespace 별 JSON 값과 저장 시각 (메모리 캐시 뒤의 2차 캐시로 사용)
+    - 할당량 장부: 날짜별 YouTube Data API 사용량 (워커들이 하나의 일일 예산을 나눠 씀)
+    저장 시각은 프로세스 간에 비교할 수 있도록 time.time() 기준입니다.
+    """
+
+    def __init__(self, path: str, max_entries: int = 50000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """DB 연결 (최초 사용 시 테이블 생성)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shared_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_shared_cache_stored ON shared_cache (namespace, stored_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS quota_usage (
+                    day TEXT PRIMARY KEY,
+                    used INTEGER NOT NULL,
+                    exhausted INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, namespace: str, keys: list) -> dict:
+        """key -> (value, stored_at) (없는 키는 결과에서 제외)"""
+        if not keys:
+            return {}
+        result = {}
+        with self._lock:
+            conn = self._connect()
+            # SQLite 변수 개수 제한 안쪽으로 나눠 조회
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT key, value, stored_at FROM shared_cache WHERE namespace = ? AND key IN ({','.join('?' * len(batch))})",
+                    [namespace, *batch]
+                ).fetchall()
+                for key, value, stored_at in rows:
+                    result[key] = (json.loads(value), stored_at)
+        self.hits += len(result)
+        self.misses += len(keys) - len(result)
+        return result
+
+    def get(self, namespace: str, key: str):
+        """(value, stored_at) 또는 None"""
+        return self.get_many(namespace, [key]).get(key)
+
+    def put_many(self, namespace: str, items: dict, stored_at: float = None):
+        """key -> value 저장 (값은 JSON 으로 직렬화 가능해야 함)"""
+        if not items:
+            return
+        stored_at = stored_at or time.time()
+        rows = [(namespace, key, json.dumps(value, ensure_ascii=False), stored_at) for key, value in items.items()]
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO shared_cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)", rows
+                )
+                self._writes += len(rows)
+                if self._writes >= 1000:
+                    # 가끔씩만 개수 한도를 넘은 오래된 항목 정리
+                    self._writes = 0
+                    self._prune(conn, namespace)
+                conn.execute("COMMIT")
+            except BaseException:
+                # 열린 트랜잭션이 남으면 이후 BEGIN 이 모두 실패하므로 되돌림
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def put(self, namespace: str, key: str, value, stored_at: float = None):
+        self.put_many(namespace, {key: value}, stored_at)
+
+    def _prune(self, conn: sqlite3.Connection, namespace: str):
+        conn.execute(
+            "DELETE FROM shared_cache WHERE namespace = ? AND stored_at < ("
+            "SELECT stored_at FROM shared_cache WHERE namespace = ? ORDER BY stored_at DESC LIMIT 1 OFFSET ?)",
+            (namespace, namespace, self.max_entries)
+        )
+
+    def reserve_quota(self, day: str, cost: int, limit: int) -> tuple:
+        """사용량 + cost 가 limit 이하이고 소진 표시가 없으면 차감 (여러 프로세스 사이에서도 원자적)
+        반환값: (성공 여부, 차감 전 사용량)"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT used, exhausted FROM quota_usage WHERE day = ?", (day,)).fetchone()
+                used, exhausted = row if row else (0, 0)
+                if exhausted or used + cost > limit:
+                    conn.execute("ROLLBACK")
+                    return False, used
+                conn.execute(
+                    "INSERT INTO quota_usage (day, used) VALUES (?, ?) "
+                    "ON CONFLICT(day) DO UPDATE SET used = used + excluded.used",
+                    (day, cost)
+                )
+                # 지난 날짜 기록 정리
+                conn.execute("DELETE FROM quota_usage WHERE day < date(?, '-7 days')", (day,))
+                conn.execute("COMMIT")
+                return True, used
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def refund_quota(self, day: str, cost: int):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE quota_usage SET used = MAX(used - ?, 0) WHERE day = ?", (cost, day))
+
+    def mark_quota_exhausted(self, day: str, daily_budget: int):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO quota_usage (day, used, exhausted) VALUES (?, ?, 1) "
+                "ON CONFLICT(day) DO UPDATE SET used = MAX(used, excluded.used), exhausted = 1",
+                (day, daily_budget)
+            )
+
+    def quota_usage(self, day: str) -> tuple:
+        """(사용량, 소진 여부)"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT used, exhausted FROM quota_usage WHERE day = ?", (day,)).fetchone()
+        return (row[0], bool(row[1])) if row else (0, False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connect()
+            entries = conn.execute("SELECT COUNT(*) FROM shared_cache").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
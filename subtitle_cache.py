@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+import time
+
+
+class SubtitleFileCache:
+    """yt-dlp 로 받은 자막 파일을 내용 해시 이름으로 보관하는 디렉터리 캐시
+
+    - objects/<sha256>.<ext> : 자막 파일 (같은 내용은 한 번만 저장)
+    - refs/<video_id>        : 해당 영상의 자막 파일 이름과 언어
+    전체 크기가 max_bytes, 파일 수가 max_files 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다.
+    (사용 시각은 파일 mtime 으로 기록하므로 재시작 후에도 유지됨)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024, max_files: int = 2000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._objects = os.path.join(directory, "objects")
+        self._refs = os.path.join(directory, "refs")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _ensure_dirs(self):
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._refs, exist_ok=True)
+
+    def get(self, video_id: str):
+        """(자막 내용, 언어) 또는 None"""
+        ref_path = os.path.join(self._refs, video_id)
+        with self._lock:
+            try:
+                with open(ref_path, "r", encoding="utf-8") as f:
+                    name, _, lang = f.read().strip().partition("\n")
+            except OSError:
+                self.misses += 1
+                return None
+            object_path = os.path.join(self._objects, name)
+            try:
+                with open(object_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, ValueError):
+                # 자막 파일이 삭제된 참조는 함께 정리
+                try:
+                    os.remove(ref_path)
+                except OSError:
+                    pass
+                self.misses += 1
+                return None
+            # 최근 사용 시각 갱신 (삭제 순서 결정용)
+            now = time.time()
+            try:
+                os.utime(object_path, (now, now))
+            except OSError:
+                pass
+            self.hits += 1
+            return content, lang
+
+    def put(self, video_id: str, lang: str, ext: str, data: bytes) -> str:
+        """자막 파일 저장 후 캐시 안의 경로 반환"""
+        name = hashlib.sha256(data).hexdigest() + "." + ext
+        object_path = os.path.join(self._objects, name)
+        with self._lock:
+            self._ensure_dirs()
+            if not os.path.exists(object_path):
+                # 다른 프로세스가 읽는 중에 반쯤 쓴 파일이 보이지 않도록 임시 파일 후 이름 변경
+                temp_path = f"{object_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, object_path)
+            ref_path = os.path.join(self._refs, video_id)
+            temp_path = f"{ref_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(f"{name}\n{lang}")
+            os.replace(temp_path, ref_path)
+            self._evict()
+        return object_path
+
+    def _evict(self):
+        """크기/개수 한도를 넘으면 오래된 파일 삭제 후 참조가 끊긴 refs 정리"""
+        files = []
+        total = 0
+        with os.scandir(self._objects) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes and len(files) <= self.max_files:
+            return
+        files.sort()
+        count = len(files)
+        for _, size, path in files:
+            if total <= self.max_bytes and count <= self.max_files:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            count -= 1
+            self.evictions += 1
+        self._prune_refs()
+
+    def _prune_refs(self):
+        """삭제된 자막 파일을 가리키는 refs 정리 (refs 가 계속 늘어나지 않도록)"""
+        with os.scandir(self._refs) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        name = f.readline().strip()
+                    if not os.path.exists(os.path.join(self._objects, name)):
+                        os.remove(entry.path)
+                except OSError:
+                    continue
+
+    def stats(self) -> dict:
+        files = 0
+        total = 0
+        with self._lock:
+            if os.path.isdir(self._objects):
+                with os.scandir(self._objects) as entries:
+                    for entry in entries:
+                        if entry.is_file() and not entry.name.endswith(".tmp"):
+                            files += 1
+                            total += entry.stat().st_size
+        return {
+            "files": files,
+            "bytes": total,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
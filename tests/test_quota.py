@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quota import QuotaScheduler, QuotaExceededError, PRIORITY_NORMAL, PRIORITY_LOW
+
+
+def test_normal_priority_can_spend_whole_budget():
+    """도구 호출(NORMAL) 은 예비분 없이 일일 예산을 모두 쓸 수 있어야 함"""
+    scheduler = QuotaScheduler(daily_budget=1000, rate=1000, burst=1000)
+
+    async def run():
+        for _ in range(10):
+            await scheduler.acquire("search", PRIORITY_NORMAL)
+        with pytest.raises(QuotaExceededError):
+            await scheduler.acquire("search", PRIORITY_NORMAL)
+
+    asyncio.run(run())
+    stats = scheduler.stats()
+    assert stats["remaining"] == 0
+    assert stats["available"] == {"high": 0, "normal": 0, "low": 0}
+
+
+def test_stats_report_available_units_per_priority():
+    scheduler = QuotaScheduler(daily_budget=1000, rate=1000, burst=1000)
+    asyncio.run(scheduler.acquire("search", PRIORITY_LOW))
+    assert scheduler.stats()["available"] == {"high": 900, "normal": 900, "low": 600}
+
+
+def test_stats_read_shared_ledger(tmp_path):
+    """ledger 를 쓰면 다른 워커가 차감한 사용량도 stats 에 반영"""
+    from shared_store import SharedStore
+
+    store = SharedStore(str(tmp_path / "shared.db"))
+    first = QuotaScheduler(daily_budget=1000, rate=1000, burst=1000, ledger=store)
+    second = QuotaScheduler(daily_budget=1000, rate=1000, burst=1000, ledger=store)
+    asyncio.run(first.acquire("search", PRIORITY_NORMAL))
+    stats = second.stats()
+    assert stats["used"] == 100
+    assert stats["available"]["normal"] == 900
@@ -0,0 +1,30 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_store import SharedStore
+
+
+def test_put_many_rolls_back_after_busy_write(tmp_path):
+    """쓰기 중 SQLITE_BUSY 가 나도 트랜잭션이 열린 채 남지 않아야 함"""
+    path = str(tmp_path / "shared.db")
+    store = SharedStore(path)
+    store.put("videos", "a", {"title": "a"})
+    # 잠금을 기다리지 않고 바로 실패하도록
+    store._connect().execute("PRAGMA busy_timeout=0")
+
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError):
+        store.put("videos", "b", {"title": "b"})
+    other.execute("ROLLBACK")
+    other.close()
+
+    assert not store._connect().in_transaction
+    store.put("videos", "c", {"title": "c"})
+    assert store.reserve_quota("2026-01-01", 100, 1000) == (True, 0)
+    assert set(store.get_many("videos", ["a", "b", "c"])) == {"a", "c"}
@@ -0,0 +1,40 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server import parse_srt_segments
+
+# YouTube 자동 생성 자막 (yt-dlp 가 받는 WebVTT) - 구간 안에 공백만 있는 줄이 있음
+AUTO_CAPTION_VTT = (
+    "WEBVTT\n"
+    "Kind: captions\n"
+    "Language: en\n"
+    "\n"
+    "00:00:00.160 --> 00:00:02.070 align:start position:0%\n"
+    " \n"
+    "hello<00:00:00.480><c> world</c>\n"
+    "\n"
+    "00:00:02.070 --> 00:00:02.080 align:start position:0%\n"
+    "hello world\n"
+    " \n"
+    "\n"
+    "00:00:02.080 --> 00:00:04.000 align:start position:0%\n"
+    "hello world\n"
+    "again<00:00:02.500><c> here</c>\n"
+)
+
+
+def test_whitespace_only_line_inside_cue_keeps_timing():
+    segments = parse_srt_segments(AUTO_CAPTION_VTT)
+    assert segments.starts[0] == 160
+    assert segments.segment_text(0) == "hello world"
+    assert segments.text == "hello world again here"
+
+
+def test_srt_with_crlf():
+    content = "1\r\n00:00:01,000 --> 00:00:02,500\r\n첫 줄\r\n\r\n2\r\n00:00:03,000 --> 00:00:04,000\r\n둘째 줄\r\n"
+    segments = parse_srt_segments(content)
+    assert list(segments.starts) == [1000, 3000]
+    assert list(segments.durations) == [1500, 1000]
+    assert segments.text == "첫 줄 둘째 줄"
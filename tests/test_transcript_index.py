@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_index import TranscriptIndex, WINDOW_CHARS
+from transcript_segments import TranscriptSegments
+
+
+def make_segments(texts: list) -> TranscriptSegments:
+    return TranscriptSegments.from_entries((i * 5, 5, text) for i, text in enumerate(texts))
+
+
+def test_multi_term_query_matches_across_windows(tmp_path):
+    """여러 단어가 서로 다른 색인 행에 있어도 같은 영상이면 검색되어야 함"""
+    index = TranscriptIndex(str(tmp_path / "index.db"))
+    filler = "x" * WINDOW_CHARS
+    index.add("split", make_segments(["파이썬 소개", filler, "비동기 프로그래밍"]))
+    index.add("only_one", make_segments(["파이썬 소개", filler, "다른 이야기"]))
+    index.add("together", make_segments(["파이썬 비동기 예제"]))
+
+    results = index.search("파이썬 비동기")
+    video_ids = [result["videoId"] for result in results]
+    assert set(video_ids) == {"split", "together"}
+    split = next(result for result in results if result["videoId"] == "split")
+    assert sorted(match["start"] for match in split["matches"]) == [0, 10]
+
+
+def test_single_term_query(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "index.db"))
+    index.add("a", make_segments(["파이썬은 재미있다"]))
+    index.add("b", make_segments(["자바스크립트"]))
+    assert [result["videoId"] for result in index.search("파이썬")] == ["a"]
@@ -0,0 +1,233 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+
+class TranscriptCache:
+    """SQLite 기반 자막 캐시 (video_id + 언어 키, TTL/용량 기반 제거)
+
+    자막을 가져올 수 없었던 영상은 실패 사유와 함께 짧은 TTL 로 따로 저장합니다 (negative cache).
+    on_evict(video_ids) 를 주면 만료/용량 초과로 모든 언어의 자막이 삭제된 영상 목록을 알려 줍니다
+    (같은 파일에 있는 전문 검색 색인도 함께 정리해 max_bytes 가 파일 크기를 계속 제한하도록).
+    여러 프로세스가 같은 파일을 쓰면 failure_memory=False 로 실패 기록의 메모리 사본을 끕니다
+    (다른 프로세스가 자막을 저장하며 지운 실패 기록을 이 프로세스가 계속 돌려주지 않도록).
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 5000, max_bytes: int = 200 * 1024 * 1024, on_evict=None,
+                 failure_memory: bool = True):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.failure_memory = failure_memory
+        self._lock = threading.Lock()
+        self._conn = None
+        self._failures = {}  # video_id -> (reason, message, expires_at) 메모리 사본
+
+    def _connect(self) -> sqlite3.Connection:
+        """DB 연결 (최초 사용 시 테이블 생성)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    transcript TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    segments BLOB,
+                    PRIMARY KEY (video_id, language)
+                )
+            """)
+            # 구간 타이밍 컬럼이 없던 이전 버전 DB 호환
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(transcripts)")]
+            if "segments" not in columns:
+                conn.execute("ALTER TABLE transcripts ADD COLUMN segments BLOB")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_accessed ON transcripts (accessed_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS failures (
+                    video_id TEXT PRIMARY KEY,
+                    reason TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, video_id: str, language: str):
+        """캐시된 자막 조회 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT transcript, method, status, created_at, segments FROM transcripts WHERE video_id = ? AND language = ?",
+                (video_id, language)
+            ).fetchone()
+            if row is None:
+                return None
+
+            transcript, method, status, created_at, segments = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ?", (video_id, language))
+                conn.commit()
+                evicted = self._uncached(conn, [video_id])
+            else:
+                evicted = None
+                conn.execute(
+                    "UPDATE transcripts SET accessed_at = ? WHERE video_id = ? AND language = ?",
+                    (now, video_id, language)
+                )
+                conn.commit()
+
+        if evicted is not None:
+            self._notify_evicted(evicted)
+            return None
+
+        return {
+            "transcript": transcript,
+            "method": method,
+            "status": status,
+            "created_at": created_at,
+            "segments": segments,
+        }
+
+    def put(self, video_id: str, language: str, transcript: str, method: str, status: str, segments: bytes = None):
+        """자막 저장 후 필요하면 오래된 항목 제거 (segments: 구간 타이밍 바이너리)"""
+        now = time.time()
+        size = len(transcript.encode("utf-8")) + len(segments or b"")
+        with self._lock:
+            conn = self._connect()
+            # 자막을 가져왔으므로 실패 기록은 삭제
+            self._failures.pop(video_id, None)
+            conn.execute("DELETE FROM failures WHERE video_id = ?", (video_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(video_id, language, transcript, method, status, size, created_at, accessed_at, segments) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (video_id, language, transcript, method, status, size, now, now, segments)
+            )
+            evicted = self._evict(conn, now)
+            conn.commit()
+        self._notify_evicted(evicted)
+
+    def get_failure(self, video_id: str):
+        """캐시된 실패 기록 조회 (없거나 만료되면 None)"""
+        now = time.time()
+        entry = self._failures.get(video_id) if self.failure_memory else None
+        if entry is not None:
+            reason, message, expires_at = entry
+            if expires_at > now:
+                return {"reason": reason, "message": message, "expires_at": expires_at}
+            self._failures.pop(video_id, None)
+
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT reason, message, expires_at FROM failures WHERE video_id = ? AND expires_at > ?",
+                (video_id, now)
+            ).fetchone()
+        if row is None:
+            return None
+
+        reason, message, expires_at = row
+        if self.failure_memory:
+            self._failures[video_id] = (reason, message, expires_at)
+        return {"reason": reason, "message": message, "expires_at": expires_at}
+
+    def put_failure(self, video_id: str, reason: str, message: str, ttl_seconds: float):
+        """자막을 가져올 수 없었던 영상을 실패 사유와 함께 ttl_seconds 동안 저장"""
+        if ttl_seconds <= 0:
+            return
+        now = time.time()
+        expires_at = now + ttl_seconds
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO failures (video_id, reason, message, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (video_id, reason, message, now, expires_at)
+            )
+            conn.execute("DELETE FROM failures WHERE expires_at <= ?", (now,))
+            conn.commit()
+            if len(self._failures) >= self.max_entries:
+                # 메모리 사본이 무한히 커지지 않도록 만료된 항목 정리
+                self._failures = {key: value for key, value in self._failures.items() if value[2] > now}
+            if self.failure_memory:
+                self._failures[video_id] = (reason, message, expires_at)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> list:
+        """만료 항목 삭제 후 개수/용량 한도를 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+        반환값: 남은 자막이 없게 된 video_id 목록"""
+        removed = []
+        if self.ttl_seconds:
+            expired_before = now - self.ttl_seconds
+            removed.extend(row[0] for row in conn.execute(
+                "SELECT video_id FROM transcripts WHERE created_at < ?", (expired_before,)
+            ))
+            conn.execute("DELETE FROM transcripts WHERE created_at < ?", (expired_before,))
+
+        count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts").fetchone()
+        if count > self.max_entries or total_size > self.max_bytes:
+            rows = conn.execute("SELECT video_id, language, size FROM transcripts ORDER BY accessed_at ASC").fetchall()
+            for video_id, language, size in rows:
+                if count <= self.max_entries and total_size <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM transcripts WHERE video_id = ? AND language = ?", (video_id, language))
+                removed.append(video_id)
+                count -= 1
+                total_size -= size
+        return self._uncached(conn, removed)
+
+    @staticmethod
+    def _uncached(conn: sqlite3.Connection, video_ids: list) -> list:
+        """video_ids 중 어떤 언어로도 자막이 남아 있지 않은 영상"""
+        return [
+            video_id for video_id in dict.fromkeys(video_ids)
+            if conn.execute("SELECT 1 FROM transcripts WHERE video_id = ? LIMIT 1", (video_id,)).fetchone() is None
+        ]
+
+    def _notify_evicted(self, video_ids: list):
+        """(잠금 밖에서 호출) 삭제된 영상을 on_evict 로 알림 - 실패해도 캐시 동작에는 영향 없음"""
+        if not video_ids or self.on_evict is None:
+            return
+        try:
+            self.on_evict(video_ids)
+        except Exception as e:
+            print(f"자막 캐시 삭제 알림 오류: {e}", file=sys.stderr)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            conn = self._connect()
+            video_ids = [row[0] for row in conn.execute("SELECT DISTINCT video_id FROM transcripts")]
+            conn.execute("DELETE FROM transcripts")
+            conn.execute("DELETE FROM failures")
+            conn.commit()
+            self._failures.clear()
+        self._notify_evicted(video_ids)
+
+    def stats(self) -> dict:
+        """캐시 항목 수와 전체 크기"""
+        with self._lock:
+            conn = self._connect()
+            count, total_size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()
+            failures = conn.execute(
+                "SELECT COUNT(*) FROM failures WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+        return {"entries": count, "bytes": total_size, "failures": failures}
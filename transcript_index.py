@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import threading
+import time
+
+# 한 색인 행에 묶을 최대 글자 수 (구간이 짧으면 여러 구간을 묶어 문구가 구간 경계에서 끊기지 않게 함)
+WINDOW_CHARS = 300
+
+
+def build_match_terms(query: str) -> list:
+    """사용자 검색어를 단어별 FTS5 MATCH 식 목록으로 변환 (단어 앞부분 일치 - 한국어 조사 허용)"""
+    terms = []
+    for word in query.split():
+        word = word.replace('"', '""')
+        terms.append(f'"{word}"*')
+    return terms
+
+
+class TranscriptIndex:
+    """SQLite FTS5 기반 자막 전문 검색 색인
+
+    자막을 가져올 때마다 구간 묶음(window) 단위로 색인하고, 각 행에 첫 구간의 시작 시각을 저장해
+    검색 결과에 영상 내 위치를 함께 돌려줍니다. 타이밍 정보가 없는 자막은 시작 시각 없이 색인합니다.
+    SQLite 에 FTS5 가 없으면 비활성화됩니다 (available == False).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._indexed = set()  # 색인된 video_id 메모리 사본 (중복 색인 확인용)
+        self.available = True
+        self.searches = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """DB 연결 (최초 사용 시 테이블 생성)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+                        text,
+                        video_id UNINDEXED,
+                        start_ms UNINDEXED,
+                        tokenize = 'unicode61 remove_diacritics 2'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                conn.close()
+                self.available = False
+                raise
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcript_fts_videos (
+                    video_id TEXT PRIMARY KEY,
+                    rows INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+            self._indexed.update(row[0] for row in conn.execute("SELECT video_id FROM transcript_fts_videos"))
+            self._conn = conn
+        return self._conn
+
+    def is_indexed(self, video_id: str) -> bool:
+        if not self.available:
+            return True  # 색인을 쓸 수 없으면 다시 색인하지 않음
+        if self._conn is None:
+            try:
+                with self._lock:
+                    self._connect()
+            except sqlite3.Error:
+                return True
+        return video_id in self._indexed
+
+    @staticmethod
+    def _windows(segments) -> list:
+        """(텍스트, 시작 밀리초) 행 목록 - 구간을 WINDOW_CHARS 글자 안쪽으로 묶음"""
+        if not segments.has_timing:
+            text = segments.text
+            return [(text[i:i + WINDOW_CHARS], None) for i in range(0, len(text), WINDOW_CHARS)]
+
+        rows = []
+        first = 0
+        for index in range(1, len(segments) + 1):
+            if index < len(segments) and segments.offsets[index] - segments.offsets[first] < WINDOW_CHARS:
+                continue
+            end = segments.offsets[index] - 1 if index < len(segments) else len(segments.text)
+            rows.append((segments.text[segments.offsets[first]:end], segments.starts[first]))
+            first = index
+        return rows
+
+    def add(self, video_id: str, segments):
+        """영상 자막 색인 (이미 있으면 교체)"""
+        if not self.available:
+            return
+        rows = [(text, video_id, start) for text, start in self._windows(segments) if text.strip()]
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM transcript_fts WHERE video_id = ?", (video_id,))
+            conn.executemany("INSERT INTO transcript_fts (text, video_id, start_ms) VALUES (?, ?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO transcript_fts_videos (video_id, rows, indexed_at) VALUES (?, ?, ?)",
+                (video_id, len(rows), time.time())
+            )
+            conn.commit()
+            self._indexed.add(video_id)
+
+    def add_if_missing(self, video_id: str, segments):
+        """아직 색인되지 않은 영상만 색인 (색인 기능 추가 전에 캐시된 자막)"""
+        if not self.is_indexed(video_id):
+            self.add(video_id, segments)
+
+    def remove(self, video_ids: list):
+        """영상 색인 삭제 (자막 캐시에서 제거된 영상 - TranscriptCache 의 on_evict)"""
+        if not self.available or not video_ids:
+            return
+        with self._lock:
+            conn = self._connect()
+            # 다른 워커가 색인한 영상일 수 있으므로 메모리 사본 대신 테이블로 확인
+            indexed = [
+                video_id for video_id in video_ids
+                if conn.execute("SELECT 1 FROM transcript_fts_videos WHERE video_id = ?", (video_id,)).fetchone()
+            ]
+            for video_id in indexed:
+                conn.execute("DELETE FROM transcript_fts WHERE video_id = ?", (video_id,))
+                conn.execute("DELETE FROM transcript_fts_videos WHERE video_id = ?", (video_id,))
+                self._indexed.discard(video_id)
+            conn.commit()
+
+    def search(self, query: str, limit: int = 10, matches_per_video: int = 3) -> list:
+        """검색어의 모든 단어가 포함된 영상 목록 (관련도 순)
+        단어들은 한 색인 행(WINDOW_CHARS 글자) 안이 아니라 영상 전체 어디에서든 나오면 일치로 봅니다.
+        반환값: [{"videoId", "score", "matches": [{"snippet", "start"}]}] - start 는 초 (타이밍 없으면 None)
+        """
+        terms = build_match_terms(query)
+        if not terms or not self.available:
+            return []
+        self.searches += 1
+        with self._lock:
+            conn = self._connect()
+            candidates = None
+            if len(terms) > 1:
+                # 단어별로 그 단어가 나오는 영상을 구해 교집합 (영상 단위 AND)
+                for term in terms:
+                    videos = {
+                        row[0] for row in
+                        conn.execute("SELECT DISTINCT video_id FROM transcript_fts WHERE transcript_fts MATCH ?", (term,))
+                    }
+                    candidates = videos if candidates is None else candidates & videos
+                    if not candidates:
+                        return []
+                # 후보 영상에서 어느 단어라도 나오는 행을 관련도 순으로 (일치 부분은 단어마다 다른 행일 수 있음)
+                rows = [
+                    row for row in conn.execute(
+                        "SELECT video_id, start_ms, snippet(transcript_fts, 0, '[', ']', '…', 16), bm25(transcript_fts) "
+                        "FROM transcript_fts WHERE transcript_fts MATCH ? ORDER BY rank",
+                        (" OR ".join(terms),)
+                    )
+                    if row[0] in candidates
+                ]
+            else:
+                # 영상 수보다 넉넉히 가져와 영상별로 묶음
+                rows = conn.execute(
+                    "SELECT video_id, start_ms, snippet(transcript_fts, 0, '[', ']', '…', 16), bm25(transcript_fts) "
+                    "FROM transcript_fts WHERE transcript_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (terms[0], limit * matches_per_video * 4)
+                ).fetchall()
+
+        results = {}
+        for video_id, start_ms, snippet, score in rows:
+            entry = results.get(video_id)
+            if entry is None:
+                if len(results) >= limit:
+                    continue
+                # bm25 는 작을수록 관련도가 높음 (부호를 바꿔 큰 값이 상위가 되도록)
+                entry = results[video_id] = {"videoId": video_id, "score": round(-score, 4), "matches": []}
+            if len(entry["matches"]) < matches_per_video:
+                entry["matches"].append({
+                    "snippet": snippet,
+                    "start": start_ms / 1000 if start_ms is not None else None,
+                })
+        return list(results.values())
+
+    def stats(self) -> dict:
+        if not self.available:
+            return {"available": False}
+        with self._lock:
+            conn = self._connect()
+            videos, rows = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM transcript_fts_videos"
+            ).fetchone()
+        return {"available": True, "videos": videos, "rows": rows, "searches": self.searches}
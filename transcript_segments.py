@@ -0,0 +1,138 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# 시작/길이는 밀리초 정수 (32비트), 텍스트 위치는 부호 없는 32비트 정수로 저장
+TIME_TYPECODE = "i"
+OFFSET_TYPECODE = "I"
+
+
+class TranscriptSegments:
+    """타임스탬프가 있는 자막 구간을 열(column) 단위로 저장하는 클래스
+
+    구간마다 dict 를 만드는 대신 시작 시각, 길이, 텍스트 시작 위치를 각각 배열로 두고
+    모든 구간의 텍스트는 공백으로 이어 붙인 하나의 문자열(text)에 저장합니다.
+    text 는 기존 도구가 반환하던 전체 자막 문자열과 같습니다.
+    타이밍 정보를 얻지 못한 자막은 배열이 비어 있습니다 (has_timing == False).
+    """
+
+    __slots__ = ("text", "starts", "durations", "offsets")
+
+    def __init__(self, text: str, starts=None, durations=None, offsets=None):
+        self.text = text
+        self.starts = starts if starts is not None else array(TIME_TYPECODE)
+        self.durations = durations if durations is not None else array(TIME_TYPECODE)
+        self.offsets = offsets if offsets is not None else array(OFFSET_TYPECODE)
+
+    @classmethod
+    def from_entries(cls, entries) -> "TranscriptSegments":
+        """(시작 초, 길이 초, 텍스트) 목록으로 생성"""
+        starts = array(TIME_TYPECODE)
+        durations = array(TIME_TYPECODE)
+        offsets = array(OFFSET_TYPECODE)
+        texts = []
+        position = 0
+        for start, duration, text in entries:
+            starts.append(int(round(float(start) * 1000)))
+            durations.append(int(round(float(duration) * 1000)))
+            offsets.append(position)
+            texts.append(text)
+            position += len(text) + 1
+        return cls(" ".join(texts), starts, durations, offsets)
+
+    @classmethod
+    def from_text(cls, text: str) -> "TranscriptSegments":
+        """타이밍 정보가 없는 자막"""
+        return cls(text)
+
+    @property
+    def has_timing(self) -> bool:
+        return len(self.starts) > 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        # __len__ 은 구간 수라서 타이밍 없는 자막도 0 이 되므로, 참/거짓은 텍스트 유무로 판단
+        return bool(self.text)
+
+    def _text_end(self, index: int) -> int:
+        """index 번째 구간 텍스트의 끝 위치 (구간 사이 공백 제외)"""
+        if index + 1 < len(self.offsets):
+            return self.offsets[index + 1] - 1
+        return len(self.text)
+
+    def segment_text(self, index: int) -> str:
+        return self.text[self.offsets[index]:self._text_end(index)]
+
+    def index_range(self, start_time: float = None, end_time: float = None) -> tuple:
+        """[start_time, end_time) 초 구간과 겹치는 구간 인덱스 범위 (first, last+1)"""
+        first = 0
+        last = len(self.starts)
+        if start_time is not None:
+            # 시작 시각 이전에 시작했지만 아직 끝나지 않은 구간도 포함
+            first = bisect_right(self.starts, int(start_time * 1000))
+            if first > 0 and self.starts[first - 1] + self.durations[first - 1] > start_time * 1000:
+                first -= 1
+        if end_time is not None:
+            last = bisect_left(self.starts, int(end_time * 1000))
+        return first, max(first, last)
+
+    def text_index_range(self, start: int, end: int) -> tuple:
+        """text[start:end] 와 겹치는 구간 인덱스 범위 (first, last+1)"""
+        first = max(bisect_right(self.offsets, start) - 1, 0)
+        last = bisect_left(self.offsets, end)
+        return first, max(first, last)
+
+    def slice(self, first: int, last: int) -> "TranscriptSegments":
+        """구간 인덱스 [first, last) 만 담은 새 객체 (텍스트 위치는 0 부터 다시 계산)"""
+        if first >= last:
+            return TranscriptSegments("")
+        base = self.offsets[first]
+        text = self.text[base:self._text_end(last - 1)]
+        offsets = array(OFFSET_TYPECODE, (offset - base for offset in self.offsets[first:last]))
+        return TranscriptSegments(text, self.starts[first:last], self.durations[first:last], offsets)
+
+    def slice_time(self, start_time: float = None, end_time: float = None) -> "TranscriptSegments":
+        """[start_time, end_time) 초 구간의 자막"""
+        first, last = self.index_range(start_time, end_time)
+        return self.slice(first, last)
+
+    def to_dict(self) -> dict:
+        """직렬화용 dict (시작/길이는 밀리초, textOffsets 는 text 안의 구간 시작 위치)"""
+        return {
+            "text": self.text,
+            "start": self.starts.tolist(),
+            "duration": self.durations.tolist(),
+            "textOffsets": self.offsets.tolist(),
+        }
+
+    def to_bytes(self) -> bytes:
+        """캐시 저장용 바이너리 (구간 수 + 시작/길이/위치 배열, little-endian)"""
+        count = array(OFFSET_TYPECODE, [len(self.starts)])
+        columns = [count, array(TIME_TYPECODE, self.starts), array(TIME_TYPECODE, self.durations), array(OFFSET_TYPECODE, self.offsets)]
+        if sys.byteorder != "little":
+            for column in columns:
+                column.byteswap()
+        return b"".join(column.tobytes() for column in columns)
+
+    @classmethod
+    def from_bytes(cls, text: str, data: bytes) -> "TranscriptSegments":
+        if not data:
+            return cls.from_text(text)
+        count = array(OFFSET_TYPECODE)
+        count.frombytes(data[:count.itemsize])
+        if sys.byteorder != "little":
+            count.byteswap()
+        size = count[0]
+        position = count.itemsize
+        columns = []
+        for typecode in (TIME_TYPECODE, TIME_TYPECODE, OFFSET_TYPECODE):
+            column = array(typecode)
+            length = size * column.itemsize
+            column.frombytes(data[position:position + length])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+            position += length
+        return cls(text, *columns)
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class AsyncTTLCache:
+    """TTL + LRU 메모리 캐시 (stale-while-revalidate 지원)
+
+    - 저장 후 ttl 초 이내: 캐시 값 그대로 반환
+    - ttl ~ ttl + stale_ttl 초: 이전 값을 바로 반환하고 백그라운드에서 새로 조회
+    - 그 이후: 새로 조회할 때까지 대기
+    같은 키를 동시에 조회하면 한 번만 로드합니다.
+    shared(SharedStore) 를 주면 여러 프로세스가 함께 쓰는 2차 캐시로 사용합니다
+    (메모리에 없으면 shared 에서 찾고, 새로 로드한 값은 shared 에도 저장).
+    """
+
+    def __init__(self, maxsize: int = 500, ttl: float = 1800, stale_ttl: float = 0,
+                 shared=None, namespace: str = "cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.shared = shared
+        self.namespace = namespace
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._inflight = {}
+        self._background = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    def _store(self, key, value, stored_at: float = None):
+        with self._lock:
+            self._entries[key] = (value, stored_at if stored_at is not None else time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def _load(self, key, loader):
+        """같은 키에 대한 동시 로드를 하나로 합침
+        로드는 별도 작업으로 실행하고 모든 호출자가 그 작업을 기다리므로, 먼저 요청한 호출자가
+        취소되어도 (예: 클라이언트 요청 취소) 다른 호출자는 결과를 그대로 받습니다."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_loader(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish_load(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_load(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 기다리는 쪽이 모두 취소되었을 때 "exception was never retrieved" 경고 방지
+            task.exception()
+
+    async def _run_loader(self, key, loader):
+        value = await loader()
+        self._store(key, value)
+        if self.shared is not None:
+            # 공유 캐시 저장은 결과 반환을 늦추지 않도록 백그라운드에서
+            background = asyncio.create_task(self._store_shared(key, value))
+            self._background.add(background)
+            background.add_done_callback(self._background.discard)
+        return value
+
+    async def _store_shared(self, key, value):
+        try:
+            await asyncio.to_thread(self.shared.put, self.namespace, self._shared_key(key), value)
+        except Exception as e:
+            print(f"공유 캐시 저장 오류: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _shared_key(key) -> str:
+        return json.dumps(key, ensure_ascii=False, default=str)
+
+    async def _load_shared(self, key):
+        """공유 캐시에서 조회 (다른 프로세스가 저장한 값) - (value, stored_at) 또는 None"""
+        try:
+            found = await asyncio.to_thread(self.shared.get, self.namespace, self._shared_key(key))
+        except Exception as e:
+            print(f"공유 캐시 조회 오류: {e}", file=sys.stderr)
+            return None
+        if found is None:
+            return None
+        value, stored_wall = found
+        # 저장 시각(time.time)을 이 프로세스의 monotonic 기준으로 변환
+        stored_at = time.monotonic() - max(time.time() - stored_wall, 0)
+        if time.monotonic() - stored_at >= self.ttl + self.stale_ttl:
+            return None
+        self._store(key, value, stored_at)
+        return value, stored_at
+
+    async def _refresh(self, key, loader):
+        try:
+            await self._load(key, loader)
+        except Exception as e:
+            # 갱신 실패 시 기존 값을 계속 사용
+            self.refresh_errors += 1
+            print(f"캐시 백그라운드 갱신 오류: {e}", file=sys.stderr)
+
+    async def get_or_load(self, key, loader, refresh_loader=None):
+        """캐시 조회, 없거나 만료되었으면 loader() 로 조회 후 저장
+        (refresh_loader 를 주면 백그라운드 갱신에는 그 함수를 사용)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.shared is not None:
+            entry = await self._load_shared(key)
+
+        if entry is not None:
+            value, stored_at = entry
+            age = now - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    task = asyncio.create_task(self._refresh(key, refresh_loader or loader))
+                    self._background.add(task)
+                    task.add_done_callback(self._background.discard)
+                return value
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "entries": size,
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "refreshErrors": self.refresh_errors,
+        }
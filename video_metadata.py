@@ -0,0 +1,188 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+
+
+class VideoMetadataStore:
+    """비디오 ID 별 메타데이터 저장소 (search / channel 도구가 공유)
+
+    videos.list 응답의 part 마다 TTL 을 따로 둡니다.
+    (snippet 은 거의 바뀌지 않으므로 길게, statistics 는 자주 바뀌므로 짧게)
+    캐시에 없는 ID 만 모아 최대 batch_size 개씩 한 번의 videos.list 호출로 가져옵니다.
+    shared(SharedStore) 를 주면 다른 프로세스가 가져온 메타데이터도 재사용합니다.
+    """
+
+    def __init__(self, fetch_batch, ttls: dict = None, maxsize: int = 10000, batch_size: int = 50,
+                 shared=None, namespace: str = "video_metadata"):
+        # fetch_batch(video_ids, parts, priority) -> videos.list 의 items 목록
+        self.fetch_batch = fetch_batch
+        self.ttls = ttls or {"snippet": 24 * 3600, "statistics": 600}
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.shared = shared
+        self.namespace = namespace
+        self._entries = OrderedDict()  # video_id -> {part: (data, stored_at)}
+        self._inflight = {}  # (video_id, part) -> Future
+        self.hits = 0
+        self.misses = 0
+        self.api_calls = 0
+
+    def _fresh_part(self, video_id: str, part: str, now: float):
+        entry = self._entries.get(video_id)
+        if entry is None or part not in entry:
+            return None
+        data, stored_at = entry[part]
+        if now - stored_at > self.ttls.get(part, 0):
+            return None
+        return data
+
+    def _store(self, item: dict, parts: tuple, now: float):
+        video_id = item.get("id")
+        if not video_id:
+            return
+        entry = self._entries.setdefault(video_id, {})
+        for part in parts:
+            self._store_part(entry, part, item.get(part, {}), now)
+        self._touch(video_id)
+
+    def _store_part(self, entry: dict, part: str, data, stored_at: float):
+        current = entry.get(part)
+        if current is None or current[1] <= stored_at:
+            entry[part] = (data, stored_at)
+
+    def _touch(self, video_id: str):
+        self._entries.move_to_end(video_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _reserve(self, video_ids: list, parts: tuple) -> dict:
+        """조회 시작 전에 진행 중 표시 (같은 영상을 동시에 요청한 쪽은 이 결과를 기다림)"""
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for video_id in video_ids:
+            for part in parts:
+                futures[(video_id, part)] = loop.create_future()
+        self._inflight.update(futures)
+        return futures
+
+    async def _fetch(self, video_ids: list, parts: tuple, priority, futures: dict):
+        """video_ids 를 batch_size 개씩 나눠 조회 후 저장"""
+        error = None
+        try:
+            batches = [video_ids[i:i + self.batch_size] for i in range(0, len(video_ids), self.batch_size)]
+            results = await asyncio.gather(
+                *[self.fetch_batch(batch, parts, priority) for batch in batches],
+                return_exceptions=True
+            )
+            self.api_calls += len(batches)
+
+            now = time.monotonic()
+            shared_items = {}
+            for batch_items in results:
+                if isinstance(batch_items, BaseException):
+                    error = batch_items
+                    continue
+                for item in batch_items:
+                    self._store(item, parts, now)
+                    if item.get("id"):
+                        for part in parts:
+                            shared_items[f"{item['id']}:{part}"] = item.get(part, {})
+            if self.shared is not None and shared_items:
+                try:
+                    await asyncio.to_thread(self.shared.put_many, self.namespace, shared_items)
+                except Exception as e:
+                    print(f"공유 메타데이터 저장 오류: {e}", file=sys.stderr)
+        except BaseException as e:
+            error = e
+        finally:
+            for key, future in futures.items():
+                self._inflight.pop(key, None)
+                if future.done():
+                    continue
+                if isinstance(error, Exception):
+                    future.set_exception(error)
+                    future.exception()  # 기다리는 쪽이 없을 때 경고 방지
+                else:
+                    future.set_result(None)
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _retrieve_error(task):
+        """기다리던 호출이 취소된 조회 작업의 예외 경고 방지"""
+        if not task.cancelled():
+            task.exception()
+
+    async def get_many(self, video_ids: list, parts: tuple = ("snippet", "statistics"), priority=None) -> dict:
+        """video_id -> {"id", part...} (찾을 수 없는 영상은 결과에서 제외)"""
+        now = time.monotonic()
+        unique_ids = list(dict.fromkeys(video_ids))
+        if self.shared is not None:
+            await self._load_shared(unique_ids, parts, now)
+
+        missing = {}  # 다시 가져올 part 조합 -> video_ids
+        waiting = []
+        for video_id in unique_ids:
+            stale_parts = tuple(part for part in parts if self._fresh_part(video_id, part, now) is None)
+            if not stale_parts:
+                self.hits += 1
+                continue
+            self.misses += 1
+            pending = [self._inflight.get((video_id, part)) for part in stale_parts]
+            if all(future is not None for future in pending):
+                waiting.extend(pending)
+            else:
+                missing.setdefault(stale_parts, []).append(video_id)
+
+        if missing or waiting:
+            # 조회는 별도 작업으로 실행 - 이 호출이 취소되어도 같은 영상을 기다리는 다른 호출은 결과를 받음
+            fetches = []
+            for stale_parts, ids in missing.items():
+                task = asyncio.create_task(self._fetch(ids, stale_parts, priority, self._reserve(ids, stale_parts)))
+                task.add_done_callback(self._retrieve_error)
+                fetches.append(task)
+            await asyncio.gather(*[asyncio.shield(future) for future in [*fetches, *waiting]])
+
+        now = time.monotonic()
+        result = {}
+        for video_id in unique_ids:
+            entry = self._entries.get(video_id)
+            if entry is None or not all(part in entry for part in parts):
+                continue
+            item = {"id": video_id}
+            for part in parts:
+                item[part] = entry[part][0]
+            result[video_id] = item
+        return result
+
+    async def _load_shared(self, video_ids: list, parts: tuple, now: float):
+        """메모리에 없거나 만료된 part 를 공유 저장소에서 가져와 메모리에 채움"""
+        keys = [
+            f"{video_id}:{part}"
+            for video_id in video_ids
+            for part in parts
+            if self._fresh_part(video_id, part, now) is None and (video_id, part) not in self._inflight
+        ]
+        if not keys:
+            return
+        try:
+            found = await asyncio.to_thread(self.shared.get_many, self.namespace, keys)
+        except Exception as e:
+            print(f"공유 메타데이터 조회 오류: {e}", file=sys.stderr)
+            return
+        wall_now = time.time()
+        for key, (data, stored_wall) in found.items():
+            video_id, part = key.rsplit(":", 1)
+            # 저장 시각(time.time)을 이 프로세스의 monotonic 기준으로 변환
+            stored_at = now - max(wall_now - stored_wall, 0)
+            self._store_part(self._entries.setdefault(video_id, {}), part, data, stored_at)
+            self._touch(video_id)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "apiCalls": self.api_calls,
+        }